@@ -0,0 +1,279 @@
+"""
+Render Benchmarks
+
+This tool measures rendering performance per notation and compares it against
+stored baselines, failing when a run is slower or uses more memory than allowed.
+
+Every case renders a fixed example from ontology/examples, or an ontology generated
+from a fixed seed, with a fixed random seed, so runs are comparable. The examples
+are small, so the generated ontology (a few thousand nodes and many biases) is what
+makes layout slowdowns stand out from timing noise. Each case is measured in three
+phases:
+- load: reading and parsing the JSON file
+- layout: building the notation graph (position calculation in Python)
+- render: running the local Graphviz engine to produce a PNG (examples only)
+
+Time is the fastest of several repeats, which is the least affected by other load
+on the machine, with the garbage collector paused while timing (as timeit does).
+Memory is the peak Python allocation during the phase (tracemalloc), measured in a
+separate pass. The render phase does not include the memory used by
+the Graphviz process itself.
+
+Baselines are stored in benchmarks/baseline.json next to this file. Timings depend
+on the machine, so baselines should be recorded on the machine that runs the checks.
+A measured case or phase without a baseline fails the check, so a baseline recorded
+with --skip-render cannot silently pass a run that renders.
+Everything runs offline.
+"""
+
+import argparse
+import gc
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Tuple
+
+from graphviz import ExecutableNotFound
+
+from render_graph import CREDIBILITY_LEVELS, create_graph, load_data
+
+EXAMPLES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'ontology', 'examples')
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmarks', 'baseline.json')
+SEED = 42
+PHASES = ['load', 'layout', 'render']
+MIN_TIME_DIFF = 0.005  # Time differences below this (seconds) are treated as noise
+MIN_MEMORY_DIFF = 64 * 1024  # Memory differences below this (bytes) are treated as noise
+GENERATED = 'generated'  # Case input standing for the generated ontology
+
+# (case name, example file or GENERATED, notation type, notation options)
+CASES = [
+    ('mini_example_2-context', 'mini_example_2.json', 'context', {}),
+    ('mini_example_2-bias', 'mini_example_2.json', 'bias', {}),
+    ('mini_example_2-sequential', 'mini_example_2.json', 'sequential', {}),
+    ('anthropotech-context', 'anthropotech.json', 'context', {}),
+    ('anthropotech-bias', 'anthropotech.json', 'bias', {}),
+    ('anthropotech-sequential', 'anthropotech.json', 'sequential', {}),
+    ('Levsha_chapter_1-context', 'Levsha_chapter_1.json', 'context', {}),
+    ('Levsha_chapter_1-bias', 'Levsha_chapter_1.json', 'bias', {}),
+    ('Levsha_chapter_1-sequential', 'Levsha_chapter_1.json', 'sequential', {}),
+    ('generated-context', GENERATED, 'context', {}),
+    ('generated-bias', GENERATED, 'bias', {}),
+    ('generated-bias-force', GENERATED, 'bias', {'layout': 'force'}),
+    ('generated-sequential', GENERATED, 'sequential', {}),
+]
+
+def generate_ontology(statements: int = 1500, biases: int = 60, seed: int = SEED) -> Dict:
+    """
+    Generate a synthetic ontology of a fixed size.
+
+    Every statement is influenced by one or two biases and responds to an earlier
+    statement; there is one argument and one quotation per four statements.
+    The same seed always gives the same ontology.
+    """
+    rng = random.Random(seed)
+    words = [f"word{i}" for i in range(500)]
+
+    def text(length: int) -> str:
+        return ' '.join(rng.choice(words) for _ in range(length))
+
+    nodes = [{'id': f'b{i}', 'type': 'cognitive_bias', 'text': f'Bias {i} {text(2)}'} for i in range(biases)]
+    edges = []
+    for i in range(statements):
+        nodes.append({'id': f's{i}', 'type': 'statement', 'text': text(12),
+                      'credibility': rng.choice(CREDIBILITY_LEVELS)})
+        for bias in rng.sample(range(biases), rng.choice([1, 1, 2])):
+            edges.append({'source': f'b{bias}', 'target': f's{i}', 'relation': 'influences'})
+        if i:
+            edges.append({'source': f's{rng.randrange(i)}', 'target': f's{i}',
+                          'relation': rng.choice(['supports', 'contradicts', 'responds_to'])})
+    for i in range(statements // 4):
+        nodes.append({'id': f'a{i}', 'type': 'argument', 'text': text(8)})
+        edges.append({'source': f'a{i}', 'target': f's{rng.randrange(statements)}', 'relation': 'supports'})
+        nodes.append({'id': f'q{i}', 'type': 'quotation', 'text': text(6)})
+        edges.append({'source': f'q{i}', 'target': f's{rng.randrange(statements)}', 'relation': 'cites'})
+
+    metadata = {
+        'title': 'Generated benchmark ontology',
+        'id_author': 'benchmark',
+        'name_author': 'Benchmark',
+        'date_time': '2024-01-01T00:00:00Z',
+        'source': f'benchmark.py (seed {seed})',
+        'version': '1.0.0'
+    }
+    return {'nodes': nodes, 'edges': edges, 'metadata': metadata}
+
+def measure(function: Callable, *args, trace: bool = False) -> Tuple[object, float]:
+    """Run a function, returning its result and elapsed time, or peak Python memory if traced."""
+    if trace:
+        tracemalloc.start()
+        result = function(*args)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return result, peak
+    gc_enabled = gc.isenabled()
+    gc.collect()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        result = function(*args)
+        elapsed = time.perf_counter() - start
+    finally:
+        if gc_enabled:
+            gc.enable()
+    return result, elapsed
+
+def run_case(input_file: str, notation_type: str, options: Dict, repeats: int = 5,
+             render: bool = True) -> Dict[str, Dict[str, float]]:
+    """
+    Measure one case.
+
+    A first untimed pass warms up lazy imports. Times are then measured over the
+    repeats, and one extra traced pass measures memory, since tracing allocations
+    slows the code down.
+
+    Returns:
+        dict: Phase name to {'time': fastest seconds, 'memory': peak bytes}
+    """
+    phases = PHASES if render else PHASES[:-1]
+    times = {phase: [] for phase in phases}
+    memory = {}
+    for repeat in range(-1, repeats + 1):
+        trace = repeat == repeats
+        samples = memory if trace else {}
+        random.seed(SEED)
+        data, samples['load'] = measure(load_data, input_file, trace=trace)
+        G, samples['layout'] = measure(create_graph, data, notation_type, options, trace=trace)
+        if render:
+            _, samples['render'] = measure(G.pipe, 'png', trace=trace)
+        if 0 <= repeat < repeats:
+            for phase in phases:
+                times[phase].append(samples[phase])
+
+    return {phase: {'time': min(times[phase]), 'memory': memory[phase]} for phase in phases}
+
+def run_benchmarks(cases: List[tuple] = CASES, repeats: int = 5, render: bool = True) -> Dict:
+    """Measure all cases, printing progress.
+
+    The generated ontology is written to a temporary file, so its load phase
+    measures JSON parsing like the examples. It is not rendered, since Graphviz
+    time on a graph of that size would dominate the run.
+    """
+    results = {}
+    with tempfile.TemporaryDirectory() as temp_dir:
+        generated_file = os.path.join(temp_dir, 'generated.json')
+        with open(generated_file, 'w', encoding='utf-8') as f:
+            json.dump(generate_ontology(), f)
+
+        for name, example, notation_type, options in cases:
+            if example == GENERATED:
+                results[name] = run_case(generated_file, notation_type, options, repeats, False)
+            else:
+                results[name] = run_case(os.path.join(EXAMPLES_DIR, example), notation_type, options,
+                                         repeats, render)
+            total = sum(phase['time'] for phase in results[name].values())
+            print(f"{name}: {total * 1000:.1f} ms")
+    return results
+
+def compare(baseline: Dict, results: Dict, threshold: float) -> List[Dict]:
+    """
+    Compare results to the baseline per case, phase and metric.
+
+    A metric regresses when it grows by more than the threshold (a fraction of the
+    baseline) and by more than the noise floor. A metric without a baseline is
+    flagged as missing.
+
+    Returns:
+        list: One row per measured metric, with 'regression' and 'missing' flags
+    """
+    rows = []
+    for case, phases in results.items():
+        for phase, metrics in phases.items():
+            base = baseline.get(case, {}).get(phase)
+            for metric, min_diff in (('time', MIN_TIME_DIFF), ('memory', MIN_MEMORY_DIFF)):
+                current = metrics[metric]
+                previous = base[metric] if base else None
+                regression = (previous is not None
+                              and current > previous * (1 + threshold)
+                              and current - previous > min_diff)
+                rows.append({
+                    'case': case, 'phase': phase, 'metric': metric,
+                    'baseline': previous, 'current': current, 'regression': regression,
+                    'missing': previous is None
+                })
+    return rows
+
+def format_value(metric: str, value: float) -> str:
+    """Format a time (as ms) or memory (as KiB) value."""
+    if value is None:
+        return '-'
+    return f"{value * 1000:.1f} ms" if metric == 'time' else f"{value / 1024:.0f} KiB"
+
+def print_comparison(rows: List[Dict]):
+    """Print the per-phase comparison table."""
+    print(f"{'case':<32} {'phase':<7} {'metric':<7} {'baseline':>12} {'current':>12} {'change':>8}")
+    for row in rows:
+        if row['missing']:
+            change = 'missing'
+        elif row['baseline']:
+            change = f"{(row['current'] / row['baseline'] - 1) * 100:+.0f}%"
+        else:
+            change = '-'
+        status = '  REGRESSION' if row['regression'] else '  NO BASELINE' if row['missing'] else ''
+        print(f"{row['case']:<32} {row['phase']:<7} {row['metric']:<7} "
+              f"{format_value(row['metric'], row['baseline']):>12} "
+              f"{format_value(row['metric'], row['current']):>12} {change:>8}{status}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark renders against stored baselines.')
+    parser.add_argument('--threshold', type=float, default=1.0,
+                        help='Allowed growth per metric as a fraction of the baseline')
+    parser.add_argument('--repeats', type=int, default=5, help='Repeats per case')
+    parser.add_argument('--baseline', default=BASELINE_FILE, help='Path to the baseline file')
+    parser.add_argument('--update', action='store_true', help='Store this run as the new baseline')
+    parser.add_argument('--skip-render', action='store_true', help='Skip the Graphviz render phase')
+    parser.add_argument('--cases', nargs='+', help='Only run cases with these names')
+    args = parser.parse_args()
+
+    unknown = set(args.cases or ()) - {case[0] for case in CASES}
+    if unknown:
+        parser.error(f"unknown cases: {', '.join(sorted(unknown))}")
+    cases = [case for case in CASES if not args.cases or case[0] in args.cases]
+    try:
+        results = run_benchmarks(cases, args.repeats, not args.skip_render)
+    except ExecutableNotFound:
+        print("Graphviz executables (dot, neato) were not found on PATH. "
+              "Install Graphviz, or run with --skip-render to measure only the Python phases.")
+        sys.exit(1)
+
+    if args.update:
+        os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump({'seed': SEED, 'repeats': args.repeats, 'results': results}, f, indent=4)
+        print(f"Baseline written to {args.baseline}")
+        sys.exit(0)
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}, run with --update to create one")
+        sys.exit(1)
+
+    with open(args.baseline, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)['results']
+
+    rows = compare(baseline, results, args.threshold)
+    print_comparison(rows)
+    regressions = [row for row in rows if row['regression']]
+    missing = [row for row in rows if row['missing']]
+    if regressions:
+        print(f"{len(regressions)} metrics regressed by more than {args.threshold * 100:.0f}%")
+    if missing:
+        print(f"{len(missing)} metrics have no baseline, record one with --update")
+        if any(row['phase'] == 'render' for row in missing):
+            print("The baseline has no render timings: record it without --skip-render "
+                  "on a machine with Graphviz installed")
+    if regressions or missing:
+        sys.exit(1)
+    print("No regressions")
@@ -0,0 +1,253 @@
+"""
+Corpus Bias Statistics
+
+This tool aggregates cognitive bias statistics across a corpus of ontology files:
+- Bias frequency: how often each bias appears, in how many files and by how many authors
+- Bias co-occurrence: pairs of biases that appear in the same ontology
+- Credibility distribution: credibility of the statements connected to each bias
+
+Biases are matched by text (case and whitespace are ignored).
+
+Each file is scanned into partial statistics that are stored in a local index keyed by
+the SHA-256 hash of the file contents, so unchanged files are never scanned again.
+File size and modification time are also stored, so files that have not been touched
+are not even re-read. Changed files are scanned in parallel worker processes, and the
+partials are merged into corpus-level tables.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Tuple
+
+from render_graph import CREDIBILITY_LEVELS, expand_inputs
+
+INDEX_VERSION = 1
+DEFAULT_INDEX = '.bias_stats_index.json'
+
+def normalize_bias(text: str) -> str:
+    """Get the key a bias text is matched by."""
+    return ' '.join(text.split()).casefold()
+
+def hash_file(file_path: str) -> str:
+    """Get the SHA-256 hash of a file's contents."""
+    with open(file_path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def scan_file(file_path: str) -> Dict:
+    """
+    Scan one ontology file into partial statistics.
+
+    Returns:
+        dict: {'author': ..., 'biases': {key: {'label', 'count', 'credibility'}}}
+    """
+    with open(file_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    metadata = data.get('metadata', {})
+    nodes = {node['id']: node for node in data['nodes']}
+
+    biases = {}
+    bias_keys = {}
+    for node in data['nodes']:
+        if node['type'] == 'cognitive_bias':
+            key = normalize_bias(node['text'])
+            bias_keys[node['id']] = key
+            entry = biases.setdefault(key, {
+                'label': node['text'],
+                'count': 0,
+                'credibility': {level: 0 for level in CREDIBILITY_LEVELS}
+            })
+            entry['count'] += 1
+
+    # Statements connected to each bias, in either direction, counted once per bias
+    connected = {key: set() for key in biases}
+    for edge in data['edges']:
+        for bias_id, other_id in ((edge['source'], edge['target']), (edge['target'], edge['source'])):
+            if bias_id in bias_keys and nodes.get(other_id, {}).get('type') == 'statement':
+                connected[bias_keys[bias_id]].add(other_id)
+
+    for key, statement_ids in connected.items():
+        for statement_id in statement_ids:
+            level = nodes[statement_id].get('credibility', 'gray')
+            biases[key]['credibility'][level] = biases[key]['credibility'].get(level, 0) + 1
+
+    return {
+        'author': metadata.get('id_author') or metadata.get('name_author'),
+        'biases': biases
+    }
+
+def load_index(index_file: str) -> Dict:
+    """Load the partial statistics index, or an empty one."""
+    if os.path.exists(index_file):
+        with open(index_file, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+        if index.get('version') == INDEX_VERSION:
+            return index
+    return {'version': INDEX_VERSION, 'files': {}, 'partials': {}}
+
+def save_index(index: Dict, index_file: str):
+    """Write the index atomically, so an interrupted run cannot corrupt it."""
+    temp_file = f"{index_file}.tmp"
+    with open(temp_file, 'w', encoding='utf-8') as f:
+        json.dump(index, f, ensure_ascii=False)
+    os.replace(temp_file, index_file)
+
+def _scan_file(file_path: str) -> Tuple[str, Dict]:
+    """Worker entry point for scan_file."""
+    return file_path, scan_file(file_path)
+
+def update_index(input_files: List[str], index: Dict, workers: int = None) -> Tuple[List[str], int]:
+    """
+    Bring the index up to date with the input files.
+
+    Entries for other files are kept, so running on part of the corpus does not
+    discard the rest. Only entries for files that no longer exist on disk, and
+    partials that no file refers to any more, are removed.
+
+    Returns:
+        tuple: (content hash per input file, number of input files that had to be scanned)
+    """
+    # Files not in this run stay indexed while they still exist
+    files = {path: entry for path, entry in index['files'].items() if os.path.exists(path)}
+    hashes = []
+    to_scan = {}
+    for file_path in input_files:
+        stat = os.stat(file_path)
+        cached = index['files'].get(os.path.abspath(file_path))
+        if cached and cached['size'] == stat.st_size and cached['mtime'] == stat.st_mtime:
+            file_hash = cached['hash']
+        else:
+            file_hash = hash_file(file_path)
+        files[os.path.abspath(file_path)] = {'size': stat.st_size, 'mtime': stat.st_mtime, 'hash': file_hash}
+        hashes.append(file_hash)
+        if file_hash not in index['partials']:
+            to_scan.setdefault(file_hash, file_path)
+
+    paths = list(to_scan.values())
+    if workers == 1 or len(paths) <= 1:
+        scanned = [_scan_file(path) for path in paths]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            scanned = list(executor.map(_scan_file, paths))
+
+    path_hashes = {path: file_hash for file_hash, path in to_scan.items()}
+    for path, partial in scanned:
+        index['partials'][path_hashes[path]] = partial
+
+    index['files'] = files
+    referenced = {entry['hash'] for entry in files.values()}
+    index['partials'] = {file_hash: partial for file_hash, partial in index['partials'].items()
+                         if file_hash in referenced}
+    # Files with identical contents share one scan
+    return hashes, sum(1 for file_hash in hashes if file_hash in to_scan)
+
+def merge_partials(partials: List[Dict]) -> Dict:
+    """
+    Merge per-file partial statistics into corpus-level tables.
+
+    Returns:
+        dict: 'frequency', 'co_occurrence' and 'credibility' tables, each a list of rows
+    """
+    labels = {}
+    counts = {}
+    files = {}
+    authors = {}
+    credibility = {}
+    pair_files = {}
+    pair_authors = {}
+
+    for partial in partials:
+        author = partial['author']
+        keys = sorted(partial['biases'])
+        for key in keys:
+            entry = partial['biases'][key]
+            labels.setdefault(key, entry['label'])
+            counts[key] = counts.get(key, 0) + entry['count']
+            files[key] = files.get(key, 0) + 1
+            if author:
+                authors.setdefault(key, set()).add(author)
+            totals = credibility.setdefault(key, {level: 0 for level in CREDIBILITY_LEVELS})
+            for level, count in entry['credibility'].items():
+                totals[level] = totals.get(level, 0) + count
+
+        for i in range(len(keys)):
+            for j in range(i + 1, len(keys)):
+                pair = (keys[i], keys[j])
+                pair_files[pair] = pair_files.get(pair, 0) + 1
+                if author:
+                    pair_authors.setdefault(pair, set()).add(author)
+
+    frequency = [
+        {'bias': labels[key], 'occurrences': counts[key], 'files': files[key],
+         'authors': len(authors.get(key, ()))}
+        for key in labels
+    ]
+    frequency.sort(key=lambda row: (-row['files'], -row['occurrences'], row['bias']))
+
+    co_occurrence = [
+        {'biases': [labels[a], labels[b]], 'files': count, 'authors': len(pair_authors.get((a, b), ()))}
+        for (a, b), count in pair_files.items()
+    ]
+    co_occurrence.sort(key=lambda row: (-row['authors'], -row['files'], row['biases']))
+
+    credibility_table = [
+        {'bias': labels[key], **credibility[key]}
+        for key in labels
+    ]
+    credibility_table.sort(key=lambda row: row['bias'])
+
+    return {'frequency': frequency, 'co_occurrence': co_occurrence, 'credibility': credibility_table}
+
+def aggregate(input_files: List[str], index_file: str = DEFAULT_INDEX, workers: int = None) -> Tuple[Dict, int]:
+    """
+    Compute corpus-level bias statistics, reusing the index for unchanged files.
+
+    Args:
+        input_files (list): Paths to ontology JSON files
+        index_file (str): Path to the partial statistics index
+        workers (int): Number of worker processes (defaults to the number of cores)
+
+    Returns:
+        tuple: (statistics tables, number of files scanned)
+    """
+    index = load_index(index_file)
+    hashes, scanned = update_index(input_files, index, workers)
+    save_index(index, index_file)
+    return merge_partials([index['partials'][file_hash] for file_hash in hashes]), scanned
+
+def print_table(title: str, rows: List[Dict], limit: int):
+    """Print the first rows of a table."""
+    print(title)
+    for row in rows[:limit]:
+        print('  ' + ', '.join(
+            f"{name}: {' + '.join(value) if isinstance(value, list) else value}" for name, value in row.items()
+        ))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Aggregate cognitive bias statistics across a corpus.')
+    parser.add_argument('inputs', nargs='+', help='Ontology JSON files or directories')
+    parser.add_argument('--index', default=DEFAULT_INDEX, help='Path to the partial statistics index')
+    parser.add_argument('--workers', type=int, default=None, help='Number of worker processes')
+    parser.add_argument('--top', type=int, default=20, help='Number of rows to print per table')
+    parser.add_argument('--output', help='Write all tables as JSON to this file')
+    args = parser.parse_args()
+
+    input_files = expand_inputs(args.inputs)
+    if not input_files:
+        print("No input files found")
+        sys.exit(1)
+
+    stats, scanned = aggregate(input_files, args.index, args.workers)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(stats, f, ensure_ascii=False, indent=4)
+
+    print_table('Bias frequency:', stats['frequency'], args.top)
+    print_table('Bias co-occurrence:', stats['co_occurrence'], args.top)
+    print_table('Statement credibility per bias:', stats['credibility'], args.top)
+    print(f"{len(input_files)} files, {scanned} scanned, {len(input_files) - scanned} from index")
@@ -0,0 +1,376 @@
+"""
+Near-Duplicate Statement Detection
+
+This tool finds differently worded `statement` nodes that express the same claim,
+within one ontology or across many ontologies from different authors.
+
+Method:
+1. Each statement text is normalized and split into word shingles
+2. A MinHash signature is computed per statement (in parallel worker processes)
+3. Signatures are split into bands and hashed into buckets (locality-sensitive hashing),
+   so only statements that share a bucket are compared
+4. Candidate pairs above the similarity threshold are joined into clusters with union-find
+
+No statement is compared against every other statement, so the run time grows
+near-linearly with the number of statements.
+
+Output:
+- Candidate duplicate clusters with estimated similarity to the cluster representative
+- Optionally, a merged ontology where each cluster collapses into its representative
+  statement and all edges are remapped accordingly
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from render_graph import expand_inputs, load_data
+
+MERSENNE_PRIME = (1 << 31) - 1
+EMPTY = np.uint32((1 << 32) - 1)  # Signature value of texts without shingles; never a real hash
+CHUNK_SIZE = 2000  # Statements per worker task
+
+def get_shingles(text: str, shingle_size: int = 2) -> List[int]:
+    """Get the hashed word shingles of a text, without repeats."""
+    words = re.findall(r'\w+', text.lower())
+    if len(words) <= shingle_size:
+        groups = [words] if words else []
+    else:
+        groups = [words[i:i + shingle_size] for i in range(len(words) - shingle_size + 1)]
+    # crc32 is stable across processes, unlike the built-in hash()
+    return sorted({zlib.crc32(' '.join(group).encode('utf-8')) for group in groups})
+
+def get_permutations(num_perm: int, seed: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+    """Get the (a, b) coefficients of the MinHash hash functions as column vectors."""
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, MERSENNE_PRIME, size=(num_perm, 1), dtype=np.uint64)
+    b = rng.integers(0, MERSENNE_PRIME, size=(num_perm, 1), dtype=np.uint64)
+    return a, b
+
+def mod_mersenne(values: np.ndarray) -> np.ndarray:
+    """Reduce uint64 values below 2^62 modulo 2^31 - 1 without a division.
+
+    Since 2^31 = 1 (mod 2^31 - 1), the high bits can be folded onto the low bits.
+    """
+    values = (values & MERSENNE_PRIME) + (values >> 31)
+    values = (values & MERSENNE_PRIME) + (values >> 31)
+    return np.where(values >= MERSENNE_PRIME, values - MERSENNE_PRIME, values)
+
+def compute_signatures(texts: List[str], num_perm: int = 128, shingle_size: int = 2,
+                       seed: int = 1) -> np.ndarray:
+    """
+    Compute MinHash signatures for a list of texts.
+
+    The hash functions h(x) = (a * x + b) mod (2^31 - 1) are evaluated for all shingles of
+    all texts at once. With 31-bit coefficients and 32-bit shingle hashes, a * x + b fits
+    in uint64, so no arithmetic overflows.
+
+    Returns:
+        np.ndarray: One row of num_perm uint32 values per text. Texts without shingles
+        get rows of EMPTY.
+    """
+    shingles = [get_shingles(text, shingle_size) for text in texts]
+    signatures = np.full((len(texts), num_perm), EMPTY, dtype=np.uint32)
+    non_empty = [i for i, text_shingles in enumerate(shingles) if text_shingles]
+    if not non_empty:
+        return signatures
+
+    counts = np.array([len(shingles[i]) for i in non_empty])
+    values = np.fromiter((x for i in non_empty for x in shingles[i]), dtype=np.uint64, count=counts.sum())
+    a, b = get_permutations(num_perm, seed)
+    hashes = mod_mersenne(a * values[None, :] + b)
+
+    # Minimum over each text's shingles
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    signatures[non_empty] = np.minimum.reduceat(hashes, starts, axis=1).T.astype(np.uint32)
+    return signatures
+
+def _compute_signatures_chunk(args: Tuple[List[str], int, int, int]) -> np.ndarray:
+    """Worker entry point for compute_signatures."""
+    return compute_signatures(*args)
+
+def compute_signatures_parallel(texts: List[str], num_perm: int = 128, shingle_size: int = 2,
+                                seed: int = 1, workers: int = None) -> np.ndarray:
+    """Compute MinHash signatures, splitting the texts across worker processes.
+
+    Texts are always processed in chunks, also without workers, since each chunk
+    holds a num_perm x shingles array of intermediate hashes in memory.
+    """
+    chunks = [(texts[i:i + CHUNK_SIZE], num_perm, shingle_size, seed)
+              for i in range(0, len(texts), CHUNK_SIZE)]
+    if not chunks:
+        return compute_signatures(texts, num_perm, shingle_size, seed)
+    if workers == 1 or len(chunks) == 1:
+        return np.concatenate([_compute_signatures_chunk(chunk) for chunk in chunks])
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # map() keeps chunk order, so signatures stay aligned with texts
+        return np.concatenate(list(executor.map(_compute_signatures_chunk, chunks)))
+
+def estimate_similarity(sig1: np.ndarray, sig2: np.ndarray) -> float:
+    """Estimate Jaccard similarity of two texts from their MinHash signatures."""
+    return np.count_nonzero(sig1 == sig2) / len(sig1)
+
+def choose_bands(num_perm: int, threshold: float) -> Tuple[int, int]:
+    """Choose (bands, rows) so that the LSH S-curve crosses near the threshold.
+
+    A pair with similarity s becomes a candidate with probability 1 - (1 - s^rows)^bands,
+    which rises most steeply around (1/bands)^(1/rows).
+    """
+    best = (num_perm, 1)
+    best_error = float('inf')
+    for rows in range(1, num_perm + 1):
+        if num_perm % rows:
+            continue
+        bands = num_perm // rows
+        error = abs((1 / bands) ** (1 / rows) - threshold)
+        # Prefer the lower crossing point on ties so fewer true duplicates are missed
+        if error < best_error:
+            best, best_error = (bands, rows), error
+    return best
+
+def group_rows(rows: np.ndarray) -> List[np.ndarray]:
+    """Group the indices of identical rows, returning only groups of two or more."""
+    if len(rows) == 0:
+        return []
+    rows = np.ascontiguousarray(rows)
+    keys = rows.view(np.dtype((np.void, rows.dtype.itemsize * rows.shape[1]))).ravel()
+    _, inverse, counts = np.unique(keys, return_inverse=True, return_counts=True)
+    order = np.argsort(inverse, kind='stable')
+    groups = np.split(order, np.cumsum(counts)[:-1])
+    return [group for group in groups if len(group) > 1]
+
+class UnionFind:
+    """Disjoint sets over integer indices with path halving and union by size."""
+
+    def __init__(self, n: int):
+        self.parent = list(range(n))
+        self.size = [1] * n
+
+    def find(self, x: int) -> int:
+        while self.parent[x] != x:
+            self.parent[x] = self.parent[self.parent[x]]
+            x = self.parent[x]
+        return x
+
+    def union(self, x: int, y: int) -> bool:
+        root_x, root_y = self.find(x), self.find(y)
+        if root_x == root_y:
+            return False
+        if self.size[root_x] < self.size[root_y]:
+            root_x, root_y = root_y, root_x
+        self.parent[root_y] = root_x
+        self.size[root_x] += self.size[root_y]
+        return True
+
+def find_duplicate_clusters(signatures: np.ndarray, threshold: float = 0.7) -> List[List[int]]:
+    """Group statements into clusters of near-duplicates using LSH banding.
+
+    Statements with identical signatures are joined first, and only one signature per
+    distinct value takes part in banding. Within each bucket all pairs of distinct
+    signatures are compared, so no candidate pair is skipped. Texts without shingles
+    are never candidates.
+
+    Returns clusters of statement indices (only clusters with two or more members),
+    each sorted so that the first index is the cluster representative.
+    """
+    if len(signatures) == 0:
+        return []
+
+    union_find = UnionFind(len(signatures))
+    candidates = np.flatnonzero(signatures[:, 0] != EMPTY)
+
+    # Identical signatures have similarity 1.0
+    distinct = np.ones(len(signatures), dtype=bool)
+    for group in group_rows(signatures[candidates]):
+        members = candidates[group]
+        for other in members[1:]:
+            union_find.union(members[0], other)
+        distinct[members[1:]] = False
+    candidates = candidates[distinct[candidates]]
+
+    bands, rows = choose_bands(signatures.shape[1], threshold)
+    min_matches = threshold * signatures.shape[1]
+    for band in range(bands):
+        band_rows = signatures[candidates, band * rows:(band + 1) * rows]
+        for group in group_rows(band_rows):
+            members = candidates[group]
+            bucket = signatures[members]
+            for i in range(len(members) - 1):
+                matches = np.count_nonzero(bucket[i + 1:] == bucket[i], axis=1)
+                for j in np.flatnonzero(matches >= min_matches):
+                    union_find.union(members[i], members[i + 1 + j])
+
+    clusters = {}
+    for i in range(len(signatures)):
+        clusters.setdefault(union_find.find(i), []).append(i)
+    return [sorted(members) for members in clusters.values() if len(members) > 1]
+
+def get_namespaces(file_paths: List[str]) -> Dict[str, str]:
+    """Get a unique node ID prefix per file, matching the schema ID pattern.
+
+    Prefixes are the file name; files whose names clash get a numeric suffix.
+    """
+    namespaces = {}
+    used = set()
+    for file_path in file_paths:
+        stem = re.sub(r'[^a-zA-Z0-9_-]', '_', os.path.splitext(os.path.basename(file_path))[0])
+        namespace = stem
+        suffix = 2
+        while namespace in used:
+            namespace = f"{stem}_{suffix}"
+            suffix += 1
+        used.add(namespace)
+        namespaces[file_path] = namespace
+    return namespaces
+
+def get_merged_id(namespaces: Dict[str, str], file_path: str, node_id: str) -> str:
+    """Get the node ID in the merged ontology (prefixed only when merging several files)."""
+    return f"{namespaces[file_path]}__{node_id}" if len(namespaces) > 1 else node_id
+
+def collect_statements(ontologies: Dict[str, Dict]) -> List[Dict]:
+    """Collect statement nodes from all ontologies with their file and merged node ID."""
+    namespaces = get_namespaces(list(ontologies))
+    statements = []
+    for file_path, data in ontologies.items():
+        for node in data['nodes']:
+            if node['type'] == 'statement':
+                statements.append({
+                    'file': file_path,
+                    'id': node['id'],
+                    'merged_id': get_merged_id(namespaces, file_path, node['id']),
+                    'text': node['text']
+                })
+    return statements
+
+def build_report(statements: List[Dict], signatures: np.ndarray,
+                 clusters: List[List[int]]) -> List[Dict]:
+    """Build the cluster report with similarity to the cluster representative."""
+    report = []
+    for members in clusters:
+        representative = members[0]
+        report.append({
+            'representative': statements[representative]['merged_id'],
+            'members': [
+                {
+                    'file': statements[i]['file'],
+                    'id': statements[i]['id'],
+                    'text': statements[i]['text'],
+                    'similarity': round(estimate_similarity(signatures[representative], signatures[i]), 3)
+                }
+                for i in members
+            ]
+        })
+    report.sort(key=lambda cluster: len(cluster['members']), reverse=True)
+    return report
+
+def merge_ontologies(ontologies: Dict[str, Dict], statements: List[Dict],
+                     clusters: List[List[int]]) -> Dict:
+    """Merge ontologies into one, collapsing each duplicate cluster into its representative.
+
+    When several files are merged, node IDs are prefixed with a unique name per file
+    so IDs from different authors cannot collide. Edges are remapped to representatives;
+    edges that become self-loops or exact repeats are dropped.
+    """
+    remap = {}
+    for members in clusters:
+        representative = statements[members[0]]['merged_id']
+        for i in members[1:]:
+            remap[statements[i]['merged_id']] = representative
+
+    namespaces = get_namespaces(list(ontologies))
+    merged_nodes = []
+    merged_edges = []
+    seen_edges = set()
+    for file_path, data in ontologies.items():
+        def merged_id(node_id: str) -> str:
+            node_id = get_merged_id(namespaces, file_path, node_id)
+            return remap.get(node_id, node_id)
+
+        for node in data['nodes']:
+            node_id = get_merged_id(namespaces, file_path, node['id'])
+            if node_id in remap:
+                continue
+            merged_nodes.append({**node, 'id': node_id})
+
+        for edge in data['edges']:
+            source = merged_id(edge['source'])
+            target = merged_id(edge['target'])
+            key = (source, target, edge['relation'])
+            if source == target or key in seen_edges:
+                continue
+            seen_edges.add(key)
+            merged_edges.append({**edge, 'source': source, 'target': target})
+
+    metadata = dict(next(iter(ontologies.values())).get('metadata', {}))
+    if len(ontologies) > 1:
+        metadata['source'] = ', '.join(os.path.basename(path) for path in ontologies)
+
+    return {'nodes': merged_nodes, 'edges': merged_edges, 'metadata': metadata}
+
+def deduplicate(input_files: List[str], threshold: float = 0.7, num_perm: int = 128,
+                shingle_size: int = 2, workers: int = None, merged_file: str = None) -> List[Dict]:
+    """
+    Find near-duplicate statements across ontology files.
+
+    Args:
+        input_files (list): Paths to ontology JSON files
+        threshold (float): Minimum estimated Jaccard similarity of shingle sets
+        num_perm (int): Number of MinHash hash functions
+        shingle_size (int): Number of words per shingle
+        workers (int): Number of worker processes (defaults to the number of cores)
+        merged_file (str): Optional path to write the merged ontology to
+
+    Returns:
+        list: Duplicate clusters, largest first
+    """
+    ontologies = {path: load_data(path) for path in input_files}
+    statements = collect_statements(ontologies)
+    signatures = compute_signatures_parallel([s['text'] for s in statements],
+                                             num_perm, shingle_size, workers=workers)
+    clusters = find_duplicate_clusters(signatures, threshold)
+
+    if merged_file:
+        merged = merge_ontologies(ontologies, statements, clusters)
+        with open(merged_file, 'w', encoding='utf-8') as f:
+            json.dump(merged, f, ensure_ascii=False, indent=4)
+
+    return build_report(statements, signatures, clusters)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Find near-duplicate statements across ontologies.')
+    parser.add_argument('inputs', nargs='+', help='Ontology JSON files or directories')
+    parser.add_argument('--threshold', type=float, default=0.7, help='Similarity threshold (0-1)')
+    parser.add_argument('--num-perm', type=int, default=128, help='Number of MinHash hash functions')
+    parser.add_argument('--shingle-size', type=int, default=2, help='Words per shingle')
+    parser.add_argument('--workers', type=int, default=None, help='Number of worker processes')
+    parser.add_argument('--merged', help='Write a merged ontology to this file')
+    parser.add_argument('--report', help='Write the cluster report as JSON to this file')
+    args = parser.parse_args()
+
+    input_files = expand_inputs(args.inputs)
+    if not input_files:
+        print("No input files found")
+        sys.exit(1)
+
+    report = deduplicate(input_files, args.threshold, args.num_perm,
+                         args.shingle_size, args.workers, args.merged)
+
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=4)
+
+    for cluster in report:
+        print(f"Cluster of {len(cluster['members'])} statements (representative: {cluster['representative']}):")
+        for member in cluster['members']:
+            print(f"  [{member['similarity']:.2f}] {member['file']}:{member['id']} {member['text']}")
+    print(f"Found {len(report)} duplicate clusters")
+    if args.merged:
+        print(f"Merged ontology written to {args.merged}")
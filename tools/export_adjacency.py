@@ -0,0 +1,199 @@
+"""
+Sparse Adjacency Export
+
+This tool exports cognitive ontology graphs as sparse adjacency matrices for
+numerical analysis.
+
+For each ontology the export contains:
+- One CSR matrix per relation type (rows are sources, columns are targets),
+  weighted by edge `strength` (1.0 when not set)
+- A node index table: row/column i of every matrix is node_ids[i]
+- A node type vector with codes into NODE_TYPES
+- A credibility vector with codes into CREDIBILITY_LEVELS (-1 for nodes
+  without credibility, statements default to gray)
+
+Type, credibility and relation codes are the renderer's lists (see render_graph.py),
+so numbering is the same for every exported file.
+
+Output formats:
+- `npz`: a single uncompressed .npz archive per ontology
+- `npy`: a directory of .npy files per ontology, which can be memory-mapped on load
+"""
+
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from render_graph import CREDIBILITY_LEVELS, NODE_TYPES, RELATION_TYPES, expand_inputs, load_data
+
+def build_csr(rows: np.ndarray, cols: np.ndarray, weights: np.ndarray,
+              n: int, dtype=np.float32) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Build CSR arrays (indptr, indices, data) for an n x n matrix.
+
+    Repeated (row, col) entries are summed.
+    """
+    if len(rows) == 0:
+        return np.zeros(n + 1, dtype=np.int64), np.zeros(0, dtype=np.int32), np.zeros(0, dtype=dtype)
+
+    keys = rows.astype(np.int64) * n + cols
+    order = np.argsort(keys, kind='stable')
+    keys = keys[order]
+    weights = weights[order]
+
+    unique_keys, starts = np.unique(keys, return_index=True)
+    data = np.add.reduceat(weights, starts).astype(dtype)
+    unique_rows = unique_keys // n
+    indices = (unique_keys % n).astype(np.int32)
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(unique_rows, minlength=n), out=indptr[1:])
+    return indptr, indices, data
+
+def build_adjacency(data: Dict) -> Dict[str, np.ndarray]:
+    """Build the adjacency arrays for one ontology.
+
+    Nodes are numbered in the order they appear in data['nodes'].
+    Edges that reference unknown nodes are skipped.
+    """
+    node_ids = [node['id'] for node in data['nodes']]
+    index = {node_id: i for i, node_id in enumerate(node_ids)}
+    n = len(node_ids)
+
+    node_types = np.array([NODE_TYPES.index(node['type']) for node in data['nodes']], dtype=np.int8)
+    credibility = np.array([
+        CREDIBILITY_LEVELS.index(node.get('credibility', 'gray'))
+        if node['type'] == 'statement' or 'credibility' in node else -1
+        for node in data['nodes']
+    ], dtype=np.int8)
+
+    arrays = {
+        'node_ids': np.array(node_ids, dtype=str),
+        'node_types': node_types,
+        'credibility': credibility,
+        'node_type_names': np.array(NODE_TYPES, dtype=str),
+        'credibility_names': np.array(CREDIBILITY_LEVELS, dtype=str),
+        'relation_names': np.array(RELATION_TYPES, dtype=str),
+        'shape': np.array([n, n], dtype=np.int64)
+    }
+
+    edges_by_relation = {relation: ([], [], []) for relation in RELATION_TYPES}
+    for edge in data['edges']:
+        if edge['source'] not in index or edge['target'] not in index:
+            continue
+        rows, cols, weights = edges_by_relation[edge['relation']]
+        rows.append(index[edge['source']])
+        cols.append(index[edge['target']])
+        weights.append(edge.get('strength', 1.0))
+
+    for relation, (rows, cols, weights) in edges_by_relation.items():
+        indptr, indices, values = build_csr(np.array(rows, dtype=np.int64),
+                                            np.array(cols, dtype=np.int64),
+                                            np.array(weights, dtype=np.float64), n)
+        arrays[f'{relation}_indptr'] = indptr
+        arrays[f'{relation}_indices'] = indices
+        arrays[f'{relation}_data'] = values
+
+    return arrays
+
+def save_adjacency(arrays: Dict[str, np.ndarray], output_path: str, output_format: str = 'npz') -> str:
+    """Save adjacency arrays as an .npz archive or a directory of .npy files."""
+    if output_format == 'npz':
+        output_file = output_path if output_path.endswith('.npz') else f"{output_path}.npz"
+        # Uncompressed, so arrays can be read without inflating the whole archive
+        np.savez(output_file, **arrays)
+        return output_file
+    if output_format == 'npy':
+        os.makedirs(output_path, exist_ok=True)
+        for name, array in arrays.items():
+            np.save(os.path.join(output_path, f"{name}.npy"), array)
+        return output_path
+    raise ValueError(f"Unknown output format: {output_format}")
+
+def load_adjacency(path: str, mmap_mode: str = 'r') -> Dict[str, np.ndarray]:
+    """
+    Load exported adjacency arrays.
+
+    Args:
+        path (str): Path to an .npz archive or a directory of .npy files
+        mmap_mode (str): Memory-map mode for .npy directories (None to read into memory)
+
+    Returns:
+        dict: Array name to array
+    """
+    if os.path.isdir(path):
+        return {
+            os.path.splitext(name)[0]: np.load(os.path.join(path, name), mmap_mode=mmap_mode)
+            for name in sorted(os.listdir(path)) if name.endswith('.npy')
+        }
+    with np.load(path) as archive:
+        return {name: archive[name] for name in archive.files}
+
+def get_matrix(arrays: Dict[str, np.ndarray], relation: str):
+    """Get the matrix for a relation type as a scipy.sparse.csr_matrix.
+
+    SciPy is optional and only needed for this helper.
+    """
+    from scipy.sparse import csr_matrix
+
+    shape = tuple(int(x) for x in arrays['shape'])
+    return csr_matrix((arrays[f'{relation}_data'],
+                       arrays[f'{relation}_indices'],
+                       arrays[f'{relation}_indptr']), shape=shape)
+
+def get_output_names(input_files: List[str]) -> List[str]:
+    """Get an output name per input file: its path relative to the inputs' common directory.
+
+    Files with the same name in different directories (a/x.json, b/x.json) get
+    different names (a/x, b/x), so their exports do not overwrite each other.
+    """
+    paths = [os.path.abspath(input_file) for input_file in input_files]
+    root = os.path.commonpath([os.path.dirname(path) for path in paths])
+    return [os.path.splitext(os.path.relpath(path, root))[0] for path in paths]
+
+def export_file(input_file: str, output_dir: str, output_format: str = 'npz', name: str = None) -> str:
+    """Export one ontology file into output_dir, named after the input file unless a name is given."""
+    arrays = build_adjacency(load_data(input_file))
+    name = name or os.path.splitext(os.path.basename(input_file))[0]
+    output_path = os.path.join(output_dir, name)
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    return save_adjacency(arrays, output_path, output_format)
+
+def _export_file(args: tuple) -> str:
+    """Worker entry point for export_file."""
+    return export_file(*args)
+
+def export_corpus(input_files: List[str], output_dir: str, output_format: str = 'npz',
+                  workers: int = None) -> List[str]:
+    """Export many ontology files in parallel worker processes.
+
+    Exports mirror the directory layout of the inputs below their common directory.
+    """
+    input_files = list(dict.fromkeys(input_files))
+    names = get_output_names(input_files)
+    tasks = [(input_file, output_dir, output_format, name) for input_file, name in zip(input_files, names)]
+
+    if workers == 1 or len(tasks) == 1:
+        return [_export_file(task) for task in tasks]
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(_export_file, tasks))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Export ontologies as sparse adjacency matrices.')
+    parser.add_argument('inputs', nargs='+', help='Ontology JSON files or directories')
+    parser.add_argument('--output-dir', default='adjacency', help='Directory to write exports to')
+    parser.add_argument('--format', choices=['npz', 'npy'], default='npz',
+                        help='npz archive, or a directory of memory-mappable .npy files')
+    parser.add_argument('--workers', type=int, default=None, help='Number of worker processes')
+    args = parser.parse_args()
+
+    input_files = expand_inputs(args.inputs)
+    if not input_files:
+        print("No input files found")
+        sys.exit(1)
+
+    for output in export_corpus(input_files, args.output_dir, args.format, args.workers):
+        print(f"Adjacency exported to {output}")
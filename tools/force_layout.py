@@ -0,0 +1,230 @@
+"""
+Force-Directed Layout
+
+A force-directed layout (Fruchterman-Reingold style) for weighted networks of
+blocks, used by the bias notation to place bias blocks.
+
+Forces:
+- Connected blocks attract each other in proportion to the connection weight,
+  so strongly linked biases end up close together
+- All blocks repel each other; larger blocks repel more strongly
+- A weak pull towards the center keeps disconnected blocks from drifting apart
+
+Repulsion is computed with the Barnes-Hut approximation: blocks are grouped into a
+quadtree, and a group that is far enough away (cell width / distance < theta) acts
+as a single block at its center. Tree construction and traversal are vectorized
+with NumPy one tree level at a time, so each step costs O(n log n).
+
+After the simulation, remaining overlaps between blocks are removed with a sweep
+along the x axis.
+"""
+
+import random
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+MAX_DEPTH = 16  # Deepest quadtree level; points closer than this are treated as one cell
+GRAVITY = 0.05  # Strength of the pull towards the center
+
+def build_quadtree(positions: np.ndarray, charges: np.ndarray) -> List[Dict[str, np.ndarray]]:
+    """
+    Build a quadtree over the positions, one entry per level.
+
+    Each level holds, for its non-empty cells: total charge, charge-weighted center,
+    number of points, the only point for single-point cells (-1 otherwise), the cell
+    of each point and the children of each cell in CSR form (child_ptr, child_idx).
+    """
+    lower = positions.min(axis=0)
+    span = max(float((positions.max(axis=0) - lower).max()), 1e-9) * (1 + 1e-9)
+    unit = (positions - lower) / span
+    n = len(positions)
+
+    levels = []
+    for depth in range(MAX_DEPTH + 1):
+        cells_per_side = 1 << depth
+        cell_xy = np.minimum((unit * cells_per_side).astype(np.int64), cells_per_side - 1)
+        keys = cell_xy[:, 0] * cells_per_side + cell_xy[:, 1]
+        unique_keys, cell_of_point = np.unique(keys, return_inverse=True)
+        m = len(unique_keys)
+
+        charge = np.bincount(cell_of_point, weights=charges, minlength=m)
+        center = np.stack([
+            np.bincount(cell_of_point, weights=charges * positions[:, 0], minlength=m),
+            np.bincount(cell_of_point, weights=charges * positions[:, 1], minlength=m)
+        ], axis=1) / charge[:, None]
+        count = np.bincount(cell_of_point, minlength=m)
+        single_point = np.full(m, -1, dtype=np.int64)
+        single = count[cell_of_point] == 1
+        single_point[cell_of_point[single]] = np.arange(n)[single]
+
+        levels.append({
+            'keys': unique_keys,
+            'width': span / cells_per_side,
+            'charge': charge,
+            'center': center,
+            'count': count,
+            'single_point': single_point,
+            'cell_of_point': cell_of_point
+        })
+        if m == n:
+            break
+
+    # Link each level to the next one
+    for depth in range(len(levels) - 1):
+        level, child_level = levels[depth], levels[depth + 1]
+        child_side = 1 << (depth + 1)
+        child_keys = child_level['keys']
+        parent_keys = (child_keys // child_side >> 1) * (child_side >> 1) + ((child_keys % child_side) >> 1)
+        parent = np.searchsorted(level['keys'], parent_keys)
+        order = np.argsort(parent, kind='stable')
+        child_ptr = np.zeros(len(level['keys']) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(parent, minlength=len(level['keys'])), out=child_ptr[1:])
+        level['child_ptr'] = child_ptr
+        level['child_idx'] = order
+
+    return levels
+
+def barnes_hut_repulsion(positions: np.ndarray, charges: np.ndarray, k: float,
+                         theta: float = 0.8) -> np.ndarray:
+    """Approximate the repulsive force k^2 * q_i * q_j / d on every point."""
+    n = len(positions)
+    forces = np.zeros_like(positions)
+    levels = build_quadtree(positions, charges)
+    min_d2 = (0.01 * k) ** 2
+
+    points = np.arange(n)
+    cells = np.zeros(n, dtype=np.int64)
+    for depth, level in enumerate(levels):
+        if len(points) == 0:
+            break
+        last = depth == len(levels) - 1
+
+        # A point does not repel itself
+        is_self = level['single_point'][cells] == points
+        points, cells = points[~is_self], cells[~is_self]
+
+        delta = positions[points] - level['center'][cells]
+        d2 = np.maximum((delta ** 2).sum(axis=1), min_d2)
+        accept = (level['width'] ** 2 < theta ** 2 * d2) | (level['count'][cells] == 1) | last
+
+        accepted_points, accepted_cells = points[accept], cells[accept]
+        charge = level['charge'][accepted_cells]
+        center = level['center'][accepted_cells]
+        # Remove the point itself from a group it belongs to
+        contains_self = level['cell_of_point'][accepted_points] == accepted_cells
+        own = charges[accepted_points] * contains_self
+        rest = np.maximum(charge - own, 1e-12)
+        center = (center * charge[:, None] - positions[accepted_points] * own[:, None]) / rest[:, None]
+        charge = charge - own
+
+        delta = positions[accepted_points] - center
+        d2 = np.maximum((delta ** 2).sum(axis=1), min_d2)
+        magnitude = k ** 2 * charges[accepted_points] * charge / d2
+        np.add.at(forces, accepted_points, delta * magnitude[:, None])
+
+        if last:
+            break
+
+        # Open the remaining cells: pair each point with every child of its cell
+        points, cells = points[~accept], cells[~accept]
+        starts = level['child_ptr'][cells]
+        counts = level['child_ptr'][cells + 1] - starts
+        offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        cells = level['child_idx'][np.repeat(starts, counts) + offsets]
+        points = np.repeat(points, counts)
+
+    return forces
+
+def remove_overlaps(positions: np.ndarray, sizes: np.ndarray, spacing: float, passes: int = 10) -> np.ndarray:
+    """Push overlapping blocks apart along the axis of least overlap."""
+    positions = positions.copy()
+    half = sizes / 2 + spacing / 2
+    max_half_width = half[:, 0].max() if len(half) else 0
+    for _ in range(passes):
+        moved = False
+        order = np.argsort(positions[:, 0])
+        for a, i in enumerate(order):
+            for j in order[a + 1:]:
+                dx = positions[j, 0] - positions[i, 0]
+                if dx >= half[i, 0] + max_half_width:
+                    break
+                dy = positions[j, 1] - positions[i, 1]
+                overlap_x = half[i, 0] + half[j, 0] - abs(dx)
+                overlap_y = half[i, 1] + half[j, 1] - abs(dy)
+                if overlap_x <= 0 or overlap_y <= 0:
+                    continue
+                moved = True
+                if overlap_x < overlap_y:
+                    shift = np.array([overlap_x / 2 * (1 if dx >= 0 else -1), 0])
+                else:
+                    shift = np.array([0, overlap_y / 2 * (1 if dy >= 0 else -1)])
+                positions[i] -= shift
+                positions[j] += shift
+        if not moved:
+            break
+    return positions
+
+def force_directed_layout(ids: List[str], weights: Dict[Tuple[str, str], float],
+                          sizes: Dict[str, Tuple[float, float]], spacing: float = 3,
+                          iterations: int = 300, theta: float = 0.8,
+                          seed: int = 1) -> Dict[str, Tuple[float, float]]:
+    """
+    Lay out weighted blocks with a force-directed simulation.
+
+    Args:
+        ids (list): Block IDs
+        weights (dict): Connection weight per (id1, id2) pair
+        sizes (dict): (width, height) per block ID
+        spacing (float): Minimum gap between blocks
+        iterations (int): Number of simulation steps
+        theta (float): Barnes-Hut accuracy (0 is exact, larger is faster)
+        seed (int): Seed for the initial positions
+
+    Returns:
+        dict: (x, y) center position per block ID
+    """
+    n = len(ids)
+    if n == 0:
+        return {}
+    index = {block_id: i for i, block_id in enumerate(ids)}
+    block_sizes = np.array([sizes[block_id] for block_id in ids], dtype=float)
+    radius = np.sqrt((block_sizes ** 2).sum(axis=1)) / 2
+
+    # Ideal distance between connected blocks
+    k = 2 * radius.mean() + spacing
+    charges = 1 + radius / k
+
+    pairs = [(index[a], index[b], w) for (a, b), w in weights.items()
+             if a in index and b in index and a != b and w > 0]
+    sources = np.array([p[0] for p in pairs], dtype=np.int64)
+    targets = np.array([p[1] for p in pairs], dtype=np.int64)
+    edge_weights = np.array([p[2] for p in pairs], dtype=float)
+    if len(edge_weights):
+        edge_weights = edge_weights / edge_weights.max()
+
+    rng = random.Random(seed)
+    scale = k * np.sqrt(n)
+    positions = np.array([[rng.uniform(-scale, scale), rng.uniform(-scale, scale)] for _ in ids])
+
+    temperature = scale / 2
+    for step in range(iterations):
+        forces = barnes_hut_repulsion(positions, charges, k, theta) if n > 1 else np.zeros_like(positions)
+
+        if len(edge_weights):
+            delta = positions[targets] - positions[sources]
+            distance = np.maximum(np.sqrt((delta ** 2).sum(axis=1)), 1e-9)
+            magnitude = edge_weights * distance / k
+            pull = delta * magnitude[:, None]
+            np.add.at(forces, sources, pull)
+            np.add.at(forces, targets, -pull)
+
+        forces -= GRAVITY * k * charges[:, None] * (positions - positions.mean(axis=0))
+
+        length = np.maximum(np.sqrt((forces ** 2).sum(axis=1)), 1e-9)
+        positions += forces / length[:, None] * np.minimum(length, temperature)[:, None]
+        temperature = scale / 2 * (1 - (step + 1) / iterations) + k * 0.01
+
+    positions = remove_overlaps(positions, block_sizes, spacing)
+    positions -= positions.mean(axis=0)
+    return {block_id: (float(positions[i, 0]), float(positions[i, 1])) for i, block_id in enumerate(ids)}
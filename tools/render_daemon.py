@@ -0,0 +1,208 @@
+"""
+Render Daemon
+
+A resident local process that runs render_graph.py commands, so repeated calls
+(e.g. from an editor on every save) skip interpreter start-up and imports.
+
+The daemon keeps warm:
+- Imported modules (graphviz, NumPy and the tools built on it)
+- Parsed ontologies (render_graph.DATA_CACHE, the most recently used files),
+  reloaded when a file changes on disk
+- The ontology schema used by validation
+
+Clients connect over a Unix socket in a directory that only the current user can
+access, and check that the socket belongs to them before sending anything. Each
+connection carries one JSON request line and receives one JSON response. Commands
+run one at a time, in the client's working directory, and their output is sent back
+to the client.
+
+The daemon does not reload its own code: restart it after updating the tools.
+"""
+
+import contextlib
+import io
+import json
+import os
+import socket
+import socketserver
+import stat
+import sys
+import tempfile
+import traceback
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+def get_socket_path(socket_path: str = None) -> str:
+    """Get the daemon socket path (in a per-user directory in the runtime or temp directory)."""
+    if socket_path:
+        return socket_path
+    runtime_dir = os.environ.get('XDG_RUNTIME_DIR') or tempfile.gettempdir()
+    return os.path.join(runtime_dir, f'cso-render-{os.getuid()}', 'render.sock')
+
+def check_owner(path: str, private: bool = False):
+    """Check that a path belongs to the current user and is not a symlink.
+
+    With private=True, the path must also be inaccessible to other users.
+
+    Raises:
+        PermissionError: If the check fails
+    """
+    info = os.lstat(path)
+    if stat.S_ISLNK(info.st_mode) or info.st_uid != os.getuid():
+        raise PermissionError(f"{path} does not belong to the current user")
+    if private and info.st_mode & 0o077:
+        raise PermissionError(f"{path} is accessible to other users")
+
+def make_socket_dir(socket_path: str):
+    """Create the default socket directory with mode 0700, or check an existing one."""
+    socket_dir = os.path.dirname(socket_path)
+    try:
+        os.mkdir(socket_dir, 0o700)
+    except FileExistsError:
+        pass
+    check_owner(socket_dir, private=True)
+
+def send_request(request: Dict, socket_path: str = None) -> Optional[Dict]:
+    """Send a request to the daemon, returning None if it is not running."""
+    path = get_socket_path(socket_path)
+    try:
+        if not socket_path:
+            check_owner(os.path.dirname(path), private=True)
+        check_owner(path)
+    except FileNotFoundError:
+        return None
+    except PermissionError as e:
+        print(f"Not using the daemon: {e}", file=sys.stderr)
+        return None
+
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.connect(path)
+            client.sendall(json.dumps(request).encode('utf-8') + b'\n')
+            client.shutdown(socket.SHUT_WR)
+            response = b''.join(iter(lambda: client.recv(65536), b''))
+    except (FileNotFoundError, ConnectionRefusedError):
+        return None
+    return json.loads(response)
+
+def send_command(argv: List[str], socket_path: str = None) -> Optional[int]:
+    """Run a command in the daemon and print its output.
+
+    Returns:
+        int: The command's exit code, or None if the daemon is not running
+    """
+    response = send_request({'argv': argv, 'cwd': os.getcwd()}, socket_path)
+    if response is None:
+        return None
+    sys.stdout.write(response['output'])
+    return response['exit_code']
+
+def run_command(argv: List[str], cwd: str) -> Dict:
+    """Run a render_graph.py command in this process, capturing its output."""
+    import render_graph
+
+    output = io.StringIO()
+    previous_cwd = os.getcwd()
+    try:
+        os.chdir(cwd)
+        with contextlib.redirect_stdout(output), contextlib.redirect_stderr(output):
+            try:
+                exit_code = render_graph.main(argv)
+            except SystemExit as e:
+                # argparse exits on usage errors and --help
+                exit_code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+            except Exception:
+                traceback.print_exc()
+                exit_code = 1
+    finally:
+        os.chdir(previous_cwd)
+    return {'output': output.getvalue(), 'exit_code': exit_code}
+
+class RequestHandler(socketserver.StreamRequestHandler):
+    """Handle one JSON request per connection."""
+
+    def handle(self):
+        request = json.loads(self.rfile.readline())
+        command = request.get('command')
+        if command == 'shutdown':
+            self.server.running = False
+            response = {'output': 'Daemon stopped\n', 'exit_code': 0}
+        elif command == 'status':
+            import render_graph
+            response = {
+                'output': f"Daemon running (pid {os.getpid()}, {len(render_graph.DATA_CACHE)} cached files)\n",
+                'exit_code': 0
+            }
+        else:
+            response = run_command(request['argv'], request['cwd'])
+        self.wfile.write(json.dumps(response).encode('utf-8'))
+
+def warm_up():
+    """Import modules and enable caches so the first command is already fast."""
+    import render_graph
+    import graphviz  # noqa: F401
+    from validate_ontology import load_schema
+
+    render_graph.DATA_CACHE = OrderedDict()
+    load_schema()
+    # NumPy-based tools are optional
+    for module in ('propagate_credibility', 'force_layout', 'temporal_index'):
+        try:
+            __import__(module)
+        except ImportError:
+            pass
+
+def serve(socket_path: str = None) -> int:
+    """Run the daemon in the foreground until it is stopped."""
+    default_path = not socket_path
+    socket_path = get_socket_path(socket_path)
+    try:
+        if default_path:
+            make_socket_dir(socket_path)
+        if os.path.lexists(socket_path):
+            check_owner(socket_path)
+    except PermissionError as e:
+        print(f"Cannot start the daemon: {e}")
+        return 1
+
+    if os.path.exists(socket_path):
+        if send_request({'command': 'status'}, socket_path) is not None:
+            print(f"Daemon already running on {socket_path}")
+            return 1
+        # Left over from a daemon that did not shut down cleanly
+        os.unlink(socket_path)
+
+    warm_up()
+
+    # Only the current user may connect
+    previous_umask = os.umask(0o177)
+    try:
+        server = socketserver.UnixStreamServer(socket_path, RequestHandler)
+    finally:
+        os.umask(previous_umask)
+
+    server.running = True
+    print(f"Daemon listening on {socket_path}")
+    sys.stdout.flush()
+    try:
+        while server.running:
+            server.handle_request()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+    return 0
+
+def run_action(action: str, socket_path: str = None) -> int:
+    """Start, stop or check the daemon."""
+    if action == 'start':
+        return serve(socket_path)
+
+    response = send_request({'command': 'shutdown' if action == 'stop' else 'status'}, socket_path)
+    if response is None:
+        print("Daemon is not running")
+        return 1
+    sys.stdout.write(response['output'])
+    return response['exit_code']
@@ -31,20 +31,97 @@ Notation Types:
 - Context: Biases as columns, statements spanning columns, citations in rightmost column
 - Bias: Each bias as a colored block containing its statements, with weighted connections showing both statement and bias relationships
 - Sequential: Linear arrangement with random vertical distribution
+
+Ontologies made of several disconnected parts can be split into connected components,
+each laid out and rendered as a separate page in parallel worker processes.
+
+Command line:
+- render: render a graph (the default when no command is given)
+- notations: list the available notation types
+- validate: check ontology files against the schema
+- daemon: run a resident process that keeps modules and parsed ontologies warm;
+  other commands are sent to it with --daemon (see render_daemon.py)
+
+Heavy modules (graphviz, NumPy and the tools built on it) are imported only by the
+functions that need them, so quick commands start fast.
 """
 
+from __future__ import annotations
+
+import argparse
+import glob
 import json
-import graphviz
-import sys
 import random
 import math
 import os
-from typing import Dict, List, Set
+import re
+import sys
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Node types, credibility levels and relations in schema order
+NODE_TYPES = ['statement', 'argument', 'cognitive_bias', 'quotation']
+CREDIBILITY_LEVELS = ['green', 'yellow', 'red', 'gray']
+RELATION_TYPES = ['supports', 'contradicts', 'influences', 'responds_to', 'quotes', 'cites', 'related_to']
+
+# Statement fill colors per credibility level
+CREDIBILITY_COLORS = {
+    'green': '#5cb85c',
+    'yellow': '#f0ad4e',
+    'red': '#d9534f',
+    'gray': '#9e9e9e'
+}
+
+# Parsed ontologies keyed by path, in least recently used order. Enabled by the
+# resident daemon as an OrderedDict (None disables caching)
+DATA_CACHE = None
+DATA_CACHE_SIZE = 64  # Most files kept in DATA_CACHE
 
 def load_data(file_path: str) -> Dict:
-    """Load data from a JSON file."""
+    """Load data from a JSON file.
+    
+    When DATA_CACHE is enabled, files that have not changed since they were last
+    loaded are returned from the cache, which keeps the DATA_CACHE_SIZE most recently
+    used files. Callers must not modify the returned data.
+    """
+    if DATA_CACHE is not None:
+        stat = os.stat(file_path)
+        key = os.path.abspath(file_path)
+        cached = DATA_CACHE.get(key)
+        if cached and cached[0] == (stat.st_mtime_ns, stat.st_size):
+            DATA_CACHE.move_to_end(key)
+            return cached[1]
+    
     with open(file_path, 'r', encoding='utf-8') as f:
-        return json.load(f)
+        data = json.load(f)
+    
+    if DATA_CACHE is not None:
+        DATA_CACHE[key] = ((stat.st_mtime_ns, stat.st_size), data)
+        DATA_CACHE.move_to_end(key)
+        while len(DATA_CACHE) > DATA_CACHE_SIZE:
+            DATA_CACHE.popitem(last=False)
+    return data
+
+def expand_inputs(inputs: List[str]) -> List[str]:
+    """Expand directories into the JSON files they contain (recursively).
+
+    Files given more than once, directly or through a directory, are listed once.
+    """
+    files = []
+    for path in inputs:
+        if os.path.isdir(path):
+            files.extend(sorted(glob.glob(os.path.join(path, '**', '*.json'), recursive=True)))
+        else:
+            files.append(path)
+    unique = {}
+    for file_path in files:
+        unique.setdefault(os.path.abspath(file_path), file_path)
+    return list(unique.values())
+
+def get_statement_fill(statement: Dict, credibility_colors: bool = False) -> str:
+    """Get the fill color of a statement: white, or its credibility color."""
+    if not credibility_colors:
+        return 'white'
+    return CREDIBILITY_COLORS.get(statement.get('credibility', 'gray'), CREDIBILITY_COLORS['gray'])
 
 def get_bias_color(index: int) -> str:
     """Get color for bias based on its index, cycling through 12 colors."""
@@ -64,8 +141,13 @@ def get_bias_color(index: int) -> str:
     ]
     return colors[index % len(colors)]
 
-def create_context_oriented_graph(data: Dict) -> graphviz.Digraph:
-    """Create a context-oriented graph visualization."""
+def create_context_oriented_graph(data: Dict, credibility_colors: bool = False,
+                                  sources: Dict = None) -> graphviz.Digraph:
+    """Create a context-oriented graph visualization.
+    
+    With credibility_colors, statements are filled by credibility instead of white.
+    """
+    import graphviz
     dot = graphviz.Digraph('Cognitive Ontology', format='png', engine='neato')
     
     # Set graph attributes
@@ -127,6 +209,7 @@ def create_context_oriented_graph(data: Dict) -> graphviz.Digraph:
         
         # Create a background subgraph for each bias column
         with dot.subgraph(name=f'cluster_{bias["id"]}') as s:
+            add_sources(sources, f'cluster_{bias["id"]}', [bias['id']])
             s.attr(style='filled')
             s.attr(bgcolor=get_bias_color(i))
             s.attr(label='')
@@ -135,9 +218,11 @@ def create_context_oriented_graph(data: Dict) -> graphviz.Digraph:
             s.attr(rank='same')
             # Add the bias node
             s.node(bias['id'], bias['text'], shape='none', pos=f'{x},{y}!')
+            add_sources(sources, bias['id'], [bias['id']])
             # Add an invisible node at the bottom to extend the color
             bottom_y = -(len(statements) + 1) * 2
             s.node(f'bottom_{bias["id"]}', '', shape='none', style='invis', pos=f'{x},{bottom_y}!')
+            add_sources(sources, f'bottom_{bias["id"]}', [bias['id']])
             # Connect bias to bottom node to create the column
             s.edge(bias['id'], f'bottom_{bias["id"]}', style='invis')
     
@@ -152,7 +237,8 @@ def create_context_oriented_graph(data: Dict) -> graphviz.Digraph:
                     pos=f'0,{y}!',
                     width='2',
                     style='filled',
-                    fillcolor='white')
+                    fillcolor=get_statement_fill(statement, credibility_colors))
+            add_sources(sources, statement['id'], [statement['id']])
         elif len(connected_biases) > 1:
             # For statements connected to multiple biases, create separate nodes in each column
             prev_node = None
@@ -166,6 +252,7 @@ def create_context_oriented_graph(data: Dict) -> graphviz.Digraph:
                 
                 # Create node ID specific to this bias column
                 node_id = f"{statement['id']}_{bias_id}"
+                add_sources(sources, node_id, [statement['id'], bias_id], [(bias_id, statement['id'])])
                 
                 # If this is the last bias column, show the text
                 if bias_id == sorted_biases[-1]:
@@ -173,7 +260,7 @@ def create_context_oriented_graph(data: Dict) -> graphviz.Digraph:
                             pos=f'{x},{y}!',
                             width='2',
                             style='filled',
-                            fillcolor='white')
+                            fillcolor=get_statement_fill(statement, credibility_colors))
                 else:
                     # For other columns, create an empty node
                     dot.node(node_id, '',
@@ -181,7 +268,7 @@ def create_context_oriented_graph(data: Dict) -> graphviz.Digraph:
                             width='2',
                             height='0.6',
                             style='filled',
-                            fillcolor='white')
+                            fillcolor=get_statement_fill(statement, credibility_colors))
                 
                 # Connect to previous node if it exists
                 if prev_node is not None:
@@ -196,7 +283,9 @@ def create_context_oriented_graph(data: Dict) -> graphviz.Digraph:
                     pos=f'{x},{y}!',
                     width='2',
                     style='filled',
-                    fillcolor='white')
+                    fillcolor=get_statement_fill(statement, credibility_colors))
+            add_sources(sources, statement['id'], [statement['id'], connected_biases[0]],
+                        [(connected_biases[0], statement['id'])])
     
     # Create context subgraph
     with dot.subgraph(name='cluster_context') as s:
@@ -238,6 +327,7 @@ def create_context_oriented_graph(data: Dict) -> graphviz.Digraph:
             s.node(quote['id'], quote['text'], 
                   shape='none', 
                   pos=f'{context_x},{y}!')
+            add_sources(sources, quote['id'], [quote['id']])
     
     # Add edges between statements and citations
     for edge in edges:
@@ -253,11 +343,17 @@ def create_context_oriented_graph(data: Dict) -> graphviz.Digraph:
             else:
                 target_node = statement
             dot.edge(target_node, edge['source'])
+            add_sources(sources, f"{target_node} -> {edge['source']}", edges=[(edge['source'], statement)])
     
     return dot
 
-def create_hierarchical_graph(data: Dict) -> graphviz.Digraph:
-    """Create a hierarchical graph visualization."""
+def create_hierarchical_graph(data: Dict, credibility_colors: bool = False,
+                              sources: Dict = None) -> graphviz.Digraph:
+    """Create a hierarchical graph visualization.
+    
+    With credibility_colors, statements are filled by credibility instead of white.
+    """
+    import graphviz
     dot = graphviz.Digraph('Cognitive Ontology', format='png', engine='neato')
     
     # Set graph attributes
@@ -298,6 +394,7 @@ def create_hierarchical_graph(data: Dict) -> graphviz.Digraph:
         
         # Create a background subgraph for each bias column
         with dot.subgraph(name=f'cluster_{bias["id"]}') as s:
+            add_sources(sources, f'cluster_{bias["id"]}', [bias['id']])
             s.attr(style='filled')
             s.attr(bgcolor=get_bias_color(i))
             s.attr(label='')
@@ -306,9 +403,11 @@ def create_hierarchical_graph(data: Dict) -> graphviz.Digraph:
             s.attr(rank='same')
             # Add the bias node
             s.node(bias['id'], bias['text'], shape='none', pos=f'{x},{y}!')
+            add_sources(sources, bias['id'], [bias['id']])
             # Add an invisible node at the bottom to extend the color
             bottom_y = -(len(statements) + 1) * 2
             s.node(f'bottom_{bias["id"]}', '', shape='none', style='invis', pos=f'{x},{bottom_y}!')
+            add_sources(sources, f'bottom_{bias["id"]}', [bias['id']])
             # Connect bias to bottom node to create the column
             s.edge(bias['id'], f'bottom_{bias["id"]}', style='invis')
     
@@ -335,7 +434,9 @@ def create_hierarchical_graph(data: Dict) -> graphviz.Digraph:
                     pos=f'{center_x},{y}!',
                     width=str(width),
                     style='filled',
-                    fillcolor='white')  # White background for statements
+                    fillcolor=get_statement_fill(statement, credibility_colors))
+            add_sources(sources, statement['id'], [statement['id'], *connected_biases],
+                        [(bias_id, statement['id']) for bias_id in connected_biases])
         else:
             # For statements connected to single bias
             bias_index = biases.index(nodes[connected_biases[0]])
@@ -344,7 +445,9 @@ def create_hierarchical_graph(data: Dict) -> graphviz.Digraph:
                     pos=f'{x},{y}!',
                     width='2',
                     style='filled',
-                    fillcolor='white')  # White background for statements
+                    fillcolor=get_statement_fill(statement, credibility_colors))
+            add_sources(sources, statement['id'], [statement['id'], connected_biases[0]],
+                        [(connected_biases[0], statement['id'])])
     
     # Create context subgraph
     with dot.subgraph(name='cluster_context') as s:
@@ -386,22 +489,30 @@ def create_hierarchical_graph(data: Dict) -> graphviz.Digraph:
             s.node(quote['id'], quote['text'], 
                   shape='none', 
                   pos=f'{context_x},{y}!')
+            add_sources(sources, quote['id'], [quote['id']])
     
     # Add edges between statements and citations
     for edge in edges:
         if nodes[edge['source']]['type'] == 'quotation' and edge['target'] in [s['id'] for s in statements]:
             dot.edge(edge['target'], edge['source'])
+            add_sources(sources, f"{edge['target']} -> {edge['source']}", edges=[(edge['source'], edge['target'])])
     
     return dot
 
-def create_bias_oriented_graph(data: Dict) -> graphviz.Digraph:
+def create_bias_oriented_graph(data: Dict, layout: str = 'grid', credibility_colors: bool = False,
+                               sources: Dict = None) -> graphviz.Digraph:
     """Create a bias-oriented graph visualization.
     
     Each bias is represented as a colored block containing its statements.
     Connections between biases show the total number of relationships:
     - Shared statements
     - Direct bias-to-bias connections
+    
+    Blocks are placed on a square grid ('grid' layout) or by a force-directed
+    simulation weighted by the number of connections ('force' layout). With
+    credibility_colors, statements are filled by credibility instead of white.
     """
+    import graphviz
     dot = graphviz.Digraph('Cognitive Ontology', format='png', engine='neato')
     
     # Set graph attributes
@@ -470,20 +581,29 @@ def create_bias_oriented_graph(data: Dict) -> graphviz.Digraph:
         block_height = content_height * 0.4  # Reduced from 1.8
         block_sizes[bias['id']] = (block_width, block_height)
     
-    # Calculate grid positions for blocks
-    n = len(biases)
-    grid_size = math.ceil(math.sqrt(n))
     min_block_spacing = 3  # Minimum space between blocks
     
-    # Calculate grid positions
-    bias_positions = {}
-    for i, bias in enumerate(biases):
-        row = i // grid_size
-        col = i % grid_size
-        block_width, block_height = block_sizes[bias['id']]
-        x = (col - grid_size/2) * (block_width + min_block_spacing)
-        y = (row - grid_size/2) * (block_height + min_block_spacing)
-        bias_positions[bias['id']] = (x, y)
+    if layout == 'force':
+        # Imported here so the grid layout does not need NumPy
+        from force_layout import force_directed_layout
+        bias_positions = force_directed_layout([bias['id'] for bias in biases],
+                                               total_connections, block_sizes,
+                                               spacing=min_block_spacing)
+    elif layout == 'grid':
+        # Calculate grid positions for blocks
+        n = len(biases)
+        grid_size = math.ceil(math.sqrt(n))
+        
+        bias_positions = {}
+        for i, bias in enumerate(biases):
+            row = i // grid_size
+            col = i % grid_size
+            block_width, block_height = block_sizes[bias['id']]
+            x = (col - grid_size/2) * (block_width + min_block_spacing)
+            y = (row - grid_size/2) * (block_height + min_block_spacing)
+            bias_positions[bias['id']] = (x, y)
+    else:
+        raise ValueError(f"Unknown bias layout: {layout}")
     
     # Create bias subgraphs with statements
     for i, bias in enumerate(biases):
@@ -491,6 +611,7 @@ def create_bias_oriented_graph(data: Dict) -> graphviz.Digraph:
         block_width, block_height = block_sizes[bias['id']]
         
         with dot.subgraph(name=f'cluster_{bias["id"]}') as s:
+            add_sources(sources, f'cluster_{bias["id"]}', [bias['id']])
             s.attr(style='filled')
             s.attr(bgcolor=get_bias_color(i))
             s.attr(label='')
@@ -509,6 +630,7 @@ def create_bias_oriented_graph(data: Dict) -> graphviz.Digraph:
                   fontsize='80',
                   width=str(block_width),
                   height='0.6')
+            add_sources(sources, f'title_{bias["id"]}', [bias['id']])
             
             # Add statements below the title
             for j, statement in enumerate(bias_statements):
@@ -518,16 +640,20 @@ def create_bias_oriented_graph(data: Dict) -> graphviz.Digraph:
                       pos=f'{x-1.4},{statement_y}!',
                       shape='box',
                       style='filled',
-                      fillcolor='white',
+                      fillcolor=get_statement_fill(statement, credibility_colors),
                       width=str(block_width - 0.2),
                       height='0.7',
                       fontsize='70')
+                add_sources(sources, f'{bias["id"]}_{statement["id"]}', [bias['id'], statement['id']],
+                            [(bias['id'], statement['id'])])
             
             # Add invisible nodes at all edges of the block for connections
             s.node(f'edge_top_{bias["id"]}', '', pos=f'{x},{y+block_height/2}!', shape='point', style='invis')
             s.node(f'edge_bottom_{bias["id"]}', '', pos=f'{x},{y-block_height/2}!', shape='point', style='invis')
             s.node(f'edge_left_{bias["id"]}', '', pos=f'{x-block_width/2},{y}!', shape='point', style='invis')
             s.node(f'edge_right_{bias["id"]}', '', pos=f'{x+block_width/2},{y}!', shape='point', style='invis')
+            for side in ('top', 'bottom', 'left', 'right'):
+                add_sources(sources, f'edge_{side}_{bias["id"]}', [bias['id']])
     
     # Add edges between biases that share statements or have direct connections
     for (bias1, bias2), total_weight in total_connections.items():
@@ -622,7 +748,7 @@ def adjust_canvas_size(positions: list, min_size: float = 20.0) -> float:
     max_y = max(abs(pos['y']) + pos['height']/2 for pos in positions)
     return max(min_size, max(max_x, max_y) + 4)  # Add padding
 
-def create_sequential_graph(data: Dict) -> graphviz.Digraph:
+def create_sequential_graph(data: Dict, sources: Dict = None) -> graphviz.Digraph:
     """Create a sequential graph visualization showing statements, biases, and arguments.
     
     The graph shows relationships between different types of objects:
@@ -631,6 +757,7 @@ def create_sequential_graph(data: Dict) -> graphviz.Digraph:
     - Arguments can only connect to statements
     - Quotations can only connect to statements
     """
+    import graphviz
     dot = graphviz.Digraph('Cognitive Ontology', format='png', engine='dot')
     
     # Set graph attributes
@@ -651,10 +778,7 @@ def create_sequential_graph(data: Dict) -> graphviz.Digraph:
     
     # Define colors
     colors = {
-        'green': '#5cb85c',
-        'yellow': '#f0ad4e',
-        'red': '#d9534f',
-        'gray': '#9e9e9e',
+        **CREDIBILITY_COLORS,
         'argument': '#b19cd9',  # Purple
         'cognitive_bias': '#f28e8c'
     }
@@ -759,6 +883,7 @@ def create_sequential_graph(data: Dict) -> graphviz.Digraph:
     # Add nodes with calculated positions
     for node in main_nodes:
         pos = node_positions[node['id']]
+        add_sources(sources, node['id'], [node['id']])
         if node['type'] == 'statement':
             color = colors.get(node.get('credibility', 'gray'), colors['gray'])
             dot.node(node['id'], 
@@ -783,6 +908,7 @@ def create_sequential_graph(data: Dict) -> graphviz.Digraph:
     
     for arg in arguments:
         pos = arg_positions[arg['id']]
+        add_sources(sources, arg['id'], [arg['id']])
         dot.node(arg['id'],
                 pos['text'],
                 shape='circle',
@@ -800,6 +926,7 @@ def create_sequential_graph(data: Dict) -> graphviz.Digraph:
         dot.edge(edge['source'], 
                 edge['target'],
                 fontsize='50')
+        add_sources(sources, f"{edge['source']} -> {edge['target']}", edges=[(edge['source'], edge['target'])])
     
     # Calculate and set final canvas size
     all_positions = list(node_positions.values()) + list(arg_positions.values())
@@ -808,47 +935,355 @@ def create_sequential_graph(data: Dict) -> graphviz.Digraph:
     
     return dot
 
-def render_graph(input_file, notation_type='hierarchical'):
+NOTATIONS = {
+    'hierarchical': create_hierarchical_graph,
+    'context': create_context_oriented_graph,
+    'bias': create_bias_oriented_graph,
+    'sequential': create_sequential_graph
+}
+
+def create_graph(data: Dict, notation_type: str = 'hierarchical', options: Dict = None,
+                 sources: Dict = None) -> graphviz.Digraph:
+    """Create a graph visualization using the given notation type.
+    
+    Options are passed to the notation function as keyword arguments. When a
+    sources dict is given, the notation records in it which ontology nodes and
+    edges each element is drawn from (see add_sources).
+    """
+    if notation_type not in NOTATIONS:
+        raise ValueError(f"Unknown notation type: {notation_type}")
+    return NOTATIONS[notation_type](data, sources=sources, **(options or {}))
+
+def split_components(data: Dict) -> List[Dict]:
+    """Split ontology data into its connected components.
+
+    Components are found with union-find over the edges (ignoring direction)
+    and returned largest first, each as ontology data with its own nodes and edges.
+    """
+    parent = {node['id']: node['id'] for node in data['nodes']}
+
+    def find(node_id: str) -> str:
+        while parent[node_id] != node_id:
+            parent[node_id] = parent[parent[node_id]]
+            node_id = parent[node_id]
+        return node_id
+
+    for edge in data['edges']:
+        if edge['source'] in parent and edge['target'] in parent:
+            root_source, root_target = find(edge['source']), find(edge['target'])
+            if root_source != root_target:
+                parent[root_target] = root_source
+
+    components = {}
+    for node in data['nodes']:
+        components.setdefault(find(node['id']), {'nodes': [], 'edges': []})['nodes'].append(node)
+    for edge in data['edges']:
+        if edge['source'] in parent:
+            components[find(edge['source'])]['edges'].append(edge)
+
+    result = []
+    for component in components.values():
+        component['metadata'] = data.get('metadata', {})
+        result.append(component)
+    result.sort(key=lambda c: len(c['nodes']), reverse=True)
+    return result
+
+def get_output_file(input_file: str, notation_type: str) -> str:
+    """Get the output path (without extension) in the visualisations directory."""
+    # Create visualisations directory if it doesn't exist
+    visualisations_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'visualisations')
+    os.makedirs(visualisations_dir, exist_ok=True)
+    
+    # Generate output filename based on input filename and notation type
+    input_filename = os.path.splitext(os.path.basename(input_file))[0]
+    return os.path.join(visualisations_dir, f"{input_filename}_{notation_type}")
+
+def _render_component(args: tuple) -> str:
+    """Lay out and render one component (worker process entry point)."""
+    component, notation_type, output_file, options = args
+    G = create_graph(component, notation_type, options)
+    G.render(output_file, cleanup=True)
+    return f"{output_file}.png"
+
+def render_components(data: Dict, notation_type: str, output_file: str, workers: int = None,
+                      options: Dict = None) -> List[str]:
+    """
+    Render each connected component as a separate page, in parallel worker processes.
+
+    Layout cost grows with the largest component instead of the whole graph.
+    Pages are numbered from the largest component down.
+
+    Returns:
+        list: Paths of the rendered pages
+    """
+    components = split_components(data)
+    tasks = [(component, notation_type, f"{output_file}_{i + 1}", options)
+             for i, component in enumerate(components)]
+    
+    if workers == 1 or len(tasks) == 1:
+        return [_render_component(task) for task in tasks]
+    
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(_render_component, tasks))
+
+NAME = r'("(?:[^"\\]|\\.)*"|[^\s"\[]+)'
+NODE_LINE = re.compile(rf'^(\s*){NAME}(?: \[(.*)\])?$', re.DOTALL)
+EDGE_LINE = re.compile(rf'^(\s*){NAME} -> {NAME}(?: \[(.*)\])?$', re.DOTALL)
+SUBGRAPH_LINE = re.compile(rf'^\s*subgraph {NAME} \{{$')
+STYLE_ATTR = re.compile(r'\s*\bstyle=("(?:[^"\\]|\\.)*"|[^\s"]+)')
+DOT_KEYWORDS = {'node', 'edge', 'graph'}  # Unquoted, these start default attribute statements
+
+def add_sources(sources: Optional[Dict], name: str, nodes: Iterable[str] = (),
+                edges: Iterable[Tuple[str, str]] = ()):
+    """
+    Record the ontology nodes and edges a Graphviz node, edge or cluster is drawn from.
+    
+    Notations call this for every element that shows ontology data, so time slices
+    can hide elements whose data does not exist yet. Graphviz edges are recorded
+    under 'tail -> head'. Elements drawn more than once under the same name get one
+    record per occurrence, in drawing order. Does nothing when sources is None.
+    
+    Args:
+        sources (dict): Element name to a list of (node IDs, edge pairs) records
+        name (str): Graphviz node or cluster name, or 'tail -> head' for edges
+        nodes: Ontology node IDs the element shows
+        edges: Ontology (source, target) pairs the element shows, in either direction
+    """
+    if sources is not None:
+        sources.setdefault(name, []).append((frozenset(nodes), frozenset(frozenset(edge) for edge in edges)))
+
+def unquote_name(name: str) -> Optional[str]:
+    """Get the name a Graphviz ID was created with, or None for attribute keywords."""
+    if name.startswith('"'):
+        return name[1:-1].replace('\\"', '"')
+    return None if name in DOT_KEYWORDS else name
+
+def hide_line(line: str, indent: str, start: str, attrs: str) -> str:
+    """Rewrite a node or edge line with style=invis, keeping its other attributes."""
+    attrs = STYLE_ATTR.sub('', attrs or '').strip()
+    return f"{indent}{start} [{attrs + ' ' if attrs else ''}style=invis]\n"
+
+def hide_absent(dot: graphviz.Digraph, sources: Dict, snapshot: Dict) -> graphviz.Digraph:
+    """
+    Get a copy of a graph with everything absent from the snapshot made invisible.
+    
+    An element is absent when an ontology node or edge recorded for it (see
+    add_sources) is not in the snapshot. Edges are also absent when one of their
+    ends is. Elements without records (titles, headers) are always shown. Absent
+    elements stay in the graph, so the layout engine places everything else
+    exactly as in the full graph.
+    """
+    present_ids = {node['id'] for node in snapshot['nodes']}
+    present_edges = {frozenset((edge['source'], edge['target'])) for edge in snapshot['edges']}
+    seen = {}
+    
+    def is_present(name: Optional[str]) -> bool:
+        records = sources.get(name)
+        if not records:
+            return True
+        # Repeated names use their records in drawing order
+        i = seen.get(name, 0)
+        seen[name] = i + 1
+        nodes, edges = records[min(i, len(records) - 1)]
+        return nodes <= present_ids and edges <= present_edges
+    
+    def is_node_present(name: Optional[str]) -> bool:
+        # Edges are drawn after their end nodes, so the last node record applies
+        records = sources.get(name)
+        if not records:
+            return True
+        nodes, edges = records[-1]
+        return nodes <= present_ids and edges <= present_edges
+    
+    frame = dot.copy()
+    body = []
+    hidden_clusters = []  # One flag per open subgraph
+    for line in dot.body:
+        subgraph = SUBGRAPH_LINE.match(line)
+        if subgraph:
+            hidden = not is_present(unquote_name(subgraph.group(1)))
+            hidden_clusters.append(hidden)
+            body.append(line)
+            if hidden:
+                body.append(line[:len(line) - len(line.lstrip())] + '\tstyle=invis\n')
+            continue
+        if line.strip() == '}' and hidden_clusters:
+            hidden_clusters.pop()
+            body.append(line)
+            continue
+        if hidden_clusters and hidden_clusters[-1] and STYLE_ATTR.fullmatch(line.rstrip('\n')):
+            # Would override the cluster's style=invis
+            continue
+        
+        edge = EDGE_LINE.match(line)
+        node = None if edge else NODE_LINE.match(line)
+        if edge:
+            tail, head = unquote_name(edge.group(2)), unquote_name(edge.group(3))
+            if not (is_present(f"{tail} -> {head}") and is_node_present(tail) and is_node_present(head)):
+                line = hide_line(line, edge.group(1), f"{edge.group(2)} -> {edge.group(3)}", edge.group(4))
+        elif node and not is_present(unquote_name(node.group(2))):
+            line = hide_line(line, node.group(1), node.group(2), node.group(3))
+        body.append(line)
+    frame.body = body
+    return frame
+
+def render_time_slices(data: Dict, notation_type: str, output_file: str, frames: int = 0,
+                       options: Dict = None) -> List[str]:
+    """
+    Render the graph as it was at a sequence of times, one frame per time.
+    
+    The graph is built once for the whole time range. Each frame is a copy in which
+    nodes and edges that do not exist yet are invisible, so the notation's engine
+    lays out every frame identically and nodes keep their place.
+    
+    Returns:
+        list: Paths of the rendered frames
+    """
+    from temporal_index import TemporalIndex
+    
+    index = TemporalIndex(data)
+    sources = {}
+    G = create_graph(data, notation_type, options, sources)
+    
+    paths = []
+    for i, time in enumerate(index.frame_times(frames)):
+        frame = hide_absent(G, sources, index.snapshot(time))
+        frame_file = f"{output_file}_t{i + 1:03d}"
+        frame.render(frame_file, cleanup=True)
+        paths.append(f"{frame_file}.png")
+    return paths
+
+def render_graph(input_file, notation_type='hierarchical', split=False, workers=None, propagate=False,
+                 bias_layout='grid', time_slices=None, credibility_colors=False):
     """
     Render a graph visualization from a JSON file.
     
     Args:
         input_file (str): Path to the input JSON file
         notation_type (str): Type of notation to use ('hierarchical', 'context', 'bias', or 'sequential')
+        split (bool): Render each connected component as a separate page
+        workers (int): Number of worker processes for split rendering (defaults to the number of cores)
+        propagate (bool): Color statements by credibility propagated along edges
+        bias_layout (str): Block layout for the bias notation ('grid' or 'force')
+        time_slices (int): Render frames over time instead of one graph
+                           (0 for one frame per distinct timestamp)
+        credibility_colors (bool): Fill statements by credibility in every notation
+                                   (the sequential notation always does; implied by propagate)
     """
     # Load data
     data = load_data(input_file)
     
-    # Create graph based on notation type
-    if notation_type == 'hierarchical':
-        G = create_hierarchical_graph(data)
-    elif notation_type == 'context':
-        G = create_context_oriented_graph(data)
-    elif notation_type == 'bias':
-        G = create_bias_oriented_graph(data)
-    elif notation_type == 'sequential':
-        G = create_sequential_graph(data)
-    else:
-        raise ValueError(f"Unknown notation type: {notation_type}")
-    
-    # Create visualisations directory if it doesn't exist
-    visualisations_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'visualisations')
-    os.makedirs(visualisations_dir, exist_ok=True)
+    if propagate:
+        # Imported here so plain renders do not need NumPy
+        from propagate_credibility import apply_credibility, propagate_credibility
+        results, _ = propagate_credibility(data)
+        data = apply_credibility(data, results)
+    output_file = get_output_file(input_file, notation_type)
+    options = {'layout': bias_layout} if notation_type == 'bias' else {}
+    if (credibility_colors or propagate) and notation_type != 'sequential':
+        options['credibility_colors'] = True
+    
+    if time_slices is not None:
+        for frame in render_time_slices(data, notation_type, output_file, time_slices, options):
+            print(f"Graph rendered to {frame}")
+        return
+    
+    if split:
+        pages = render_components(data, notation_type, output_file, workers, options)
+        for page in pages:
+            print(f"Graph rendered to {page}")
+        return
     
-    # Generate output filename based on input filename and notation type
-    input_filename = os.path.splitext(os.path.basename(input_file))[0]
-    output_file = os.path.join(visualisations_dir, f"{input_filename}_{notation_type}")
+    # Create graph based on notation type
+    G = create_graph(data, notation_type, options)
     
     # Render graph
     G.render(output_file, cleanup=True)
     print(f"Graph rendered to {output_file}.png")
 
-if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print("Usage: python render_graph.py <input_file> [notation_type]")
-        sys.exit(1)
-    
-    input_file = sys.argv[1]
-    notation_type = sys.argv[2] if len(sys.argv) > 2 else 'hierarchical'
+COMMANDS = ['render', 'notations', 'validate', 'daemon']
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the command line parser."""
+    parser = argparse.ArgumentParser(description='Render and check cognitive ontology graphs.')
+    parser.add_argument('--daemon', action='store_true',
+                        help='Run the command in the resident daemon if it is running')
+    parser.add_argument('--socket', default=None, help='Path to the daemon socket')
+    commands = parser.add_subparsers(dest='command', required=True)
+    
+    render = commands.add_parser('render', help='Render a graph')
+    render.add_argument('input_file', help='Path to the input JSON file')
+    render.add_argument('notation_type', nargs='?', default='hierarchical',
+                        choices=list(NOTATIONS), help='Notation type')
+    render.add_argument('--split-components', action='store_true',
+                        help='Render each connected component as a separate page')
+    render.add_argument('--workers', type=int, default=None,
+                        help='Number of worker processes for --split-components')
+    render.add_argument('--propagate-credibility', action='store_true',
+                        help='Color statements by credibility propagated along edges')
+    render.add_argument('--credibility-colors', action='store_true',
+                        help='Color statements by credibility in every notation, not only sequential')
+    render.add_argument('--bias-layout', choices=['grid', 'force'], default='grid',
+                        help='Block layout for the bias notation')
+    render.add_argument('--time-slices', type=int, nargs='?', const=0, default=None, metavar='FRAMES',
+                        help='Render frames of the graph over time (one per timestamp if FRAMES is not given)')
+    
+    commands.add_parser('notations', help='List the available notation types')
+    
+    validate = commands.add_parser('validate', help='Check ontology files against the schema')
+    validate.add_argument('input_files', nargs='+', help='Paths to JSON files')
+    
+    daemon = commands.add_parser('daemon', help='Start, stop or check the resident daemon')
+    daemon.add_argument('action', choices=['start', 'stop', 'status'], help='Daemon action')
+    return parser
+
+def main(argv: List[str]) -> int:
+    """Run the command line, returning the exit code."""
+    # Without a command, arguments are passed to render as before
+    argv = list(argv)
+    command_start = 0
+    while command_start < len(argv) and argv[command_start].startswith('-'):
+        command_start += 2 if argv[command_start] == '--socket' else 1
+    if command_start < len(argv) and argv[command_start] not in COMMANDS:
+        argv.insert(command_start, 'render')
+    args = build_parser().parse_args(argv)
+    
+    if args.command == 'daemon':
+        import render_daemon
+        return render_daemon.run_action(args.action, args.socket)
+    
+    if args.daemon:
+        import render_daemon
+        # Falls back to running the command here if the daemon is not running
+        exit_code = render_daemon.send_command(argv[command_start:], args.socket)
+        if exit_code is not None:
+            return exit_code
+    
+    if args.command == 'notations':
+        for notation_type in NOTATIONS:
+            print(notation_type)
+        return 0
+    
+    if args.command == 'validate':
+        from validate_ontology import validate_data
+        exit_code = 0
+        for input_file in args.input_files:
+            try:
+                errors = validate_data(load_data(input_file))
+            except (OSError, ValueError) as e:
+                errors = [str(e)]
+            if errors:
+                exit_code = 1
+                for error in errors:
+                    print(f"{input_file}: {error}")
+            else:
+                print(f"{input_file}: OK")
+        return exit_code
     
-    render_graph(input_file, notation_type) 
\ No newline at end of file
+    render_graph(args.input_file, args.notation_type, args.split_components, args.workers,
+                 args.propagate_credibility, args.bias_layout, args.time_slices, args.credibility_colors)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,103 @@
+"""
+Temporal Index
+
+A time index over ontology nodes and edges, based on node `timestamp` and edge
+`metadata.timestamp` (see schema.json).
+
+Rules:
+- Nodes without a timestamp are present at all times
+- An edge cannot exist before both of its nodes, so its effective time is the latest
+  of its own timestamp and its nodes' timestamps
+- Edges without a timestamp appear together with their nodes
+
+Nodes and edges are kept sorted by effective time, so the state of the graph at
+time T is a prefix of each list, found by binary search in O(log n). Snapshots
+return that prefix in the original file order, since notations assign colors and
+columns by position. Range queries return the slice between two binary searches.
+"""
+
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timezone
+from typing import Dict, List
+
+ALWAYS = float('-inf')  # Effective time of items without timestamps
+
+def parse_timestamp(value: str) -> float:
+    """Parse an ISO 8601 date-time into seconds since the epoch (UTC if no zone is given)."""
+    parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+def format_timestamp(value: float) -> str:
+    """Format seconds since the epoch as an ISO 8601 date-time in UTC."""
+    return datetime.fromtimestamp(value, tz=timezone.utc).isoformat()
+
+class TemporalIndex:
+    """Sorted time index over the nodes and edges of one ontology."""
+
+    def __init__(self, data: Dict):
+        self.metadata = data.get('metadata', {})
+
+        node_times = {}
+        for node in data['nodes']:
+            node_times[node['id']] = parse_timestamp(node['timestamp']) if 'timestamp' in node else ALWAYS
+
+        # Sorting is stable, so the file position breaks ties between equal times
+        order = sorted(range(len(data['nodes'])), key=lambda i: node_times[data['nodes'][i]['id']])
+        self.nodes = [data['nodes'][i] for i in order]
+        self.node_times = [node_times[node['id']] for node in self.nodes]
+        self.node_positions = order
+
+        timed_edges = []
+        for position, edge in enumerate(data['edges']):
+            if edge['source'] not in node_times or edge['target'] not in node_times:
+                continue
+            timestamp = edge.get('metadata', {}).get('timestamp')
+            edge_time = parse_timestamp(timestamp) if timestamp else ALWAYS
+            timed_edges.append((max(edge_time, node_times[edge['source']], node_times[edge['target']]),
+                                position, edge))
+        timed_edges.sort(key=lambda item: item[:2])
+        self.edges = [edge for _, _, edge in timed_edges]
+        self.edge_times = [edge_time for edge_time, _, _ in timed_edges]
+        self.edge_positions = [position for _, position, _ in timed_edges]
+
+    def times(self) -> List[float]:
+        """Get the distinct times at which the graph changes, in order."""
+        return sorted({t for t in self.node_times + self.edge_times if t != ALWAYS})
+
+    def nodes_between(self, start: float, end: float) -> List[Dict]:
+        """Get the nodes that appear in the time range [start, end]."""
+        return self.nodes[bisect_left(self.node_times, start):bisect_right(self.node_times, end)]
+
+    def edges_between(self, start: float, end: float) -> List[Dict]:
+        """Get the edges that appear in the time range [start, end]."""
+        return self.edges[bisect_left(self.edge_times, start):bisect_right(self.edge_times, end)]
+
+    def snapshot(self, time: float) -> Dict:
+        """Get the ontology data as it was at the given time, in file order."""
+        node_count = bisect_right(self.node_times, time)
+        edge_count = bisect_right(self.edge_times, time)
+        node_order = sorted(range(node_count), key=self.node_positions.__getitem__)
+        edge_order = sorted(range(edge_count), key=self.edge_positions.__getitem__)
+        return {
+            'nodes': [self.nodes[i] for i in node_order],
+            'edges': [self.edges[i] for i in edge_order],
+            'metadata': self.metadata
+        }
+
+    def frame_times(self, frames: int = 0) -> List[float]:
+        """Get the times to render frames at.
+
+        With frames == 0 there is one frame per distinct time, otherwise the frames
+        are spread evenly between the first and last time.
+        """
+        times = self.times()
+        if not times:
+            return [ALWAYS]
+        if frames <= 0:
+            return times
+        if frames == 1 or times[0] == times[-1]:
+            return [times[-1]]
+        step = (times[-1] - times[0]) / (frames - 1)
+        return [times[0] + i * step for i in range(frames)]
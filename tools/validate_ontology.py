@@ -0,0 +1,99 @@
+"""
+Ontology Validation
+
+Checks ontology data against ontology/schema.json and for consistency the schema
+cannot express:
+- Node IDs are unique
+- Edges connect existing nodes
+
+Only the parts of JSON Schema used by schema.json are interpreted (type, enum,
+required, properties, additionalProperties, items, pattern, minLength, minimum,
+maximum), so validation needs no extra dependencies.
+"""
+
+import json
+import os
+import re
+from typing import Dict, List
+
+SCHEMA_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'ontology', 'schema.json')
+
+JSON_TYPES = {
+    'object': dict,
+    'array': list,
+    'string': str,
+    'integer': int,
+    'number': (int, float),
+    'boolean': bool
+}
+
+_schema = None
+
+def load_schema() -> Dict:
+    """Load the ontology schema (once per process)."""
+    global _schema
+    if _schema is None:
+        with open(SCHEMA_FILE, 'r', encoding='utf-8') as f:
+            _schema = json.load(f)
+    return _schema
+
+def check_value(value, schema: Dict, path: str, errors: List[str]):
+    """Check a value against a schema, appending errors with their path."""
+    expected = schema.get('type')
+    if expected:
+        python_type = JSON_TYPES[expected]
+        # bool is a subclass of int, but not a JSON number
+        if not isinstance(value, python_type) or (isinstance(value, bool) and expected != 'boolean'):
+            errors.append(f"{path}: expected {expected}")
+            return
+
+    if 'enum' in schema and value not in schema['enum']:
+        errors.append(f"{path}: {value!r} is not one of {schema['enum']}")
+    if 'pattern' in schema and isinstance(value, str) and not re.search(schema['pattern'], value):
+        errors.append(f"{path}: {value!r} does not match {schema['pattern']}")
+    if 'minLength' in schema and isinstance(value, str) and len(value) < schema['minLength']:
+        errors.append(f"{path}: shorter than {schema['minLength']}")
+    if 'minimum' in schema and isinstance(value, (int, float)) and value < schema['minimum']:
+        errors.append(f"{path}: less than {schema['minimum']}")
+    if 'maximum' in schema and isinstance(value, (int, float)) and value > schema['maximum']:
+        errors.append(f"{path}: greater than {schema['maximum']}")
+
+    if isinstance(value, dict):
+        properties = schema.get('properties', {})
+        for name in schema.get('required', []):
+            if name not in value:
+                errors.append(f"{path}: missing required property '{name}'")
+        for name, item in value.items():
+            if name in properties:
+                check_value(item, properties[name], f"{path}.{name}", errors)
+            elif schema.get('additionalProperties') is False:
+                errors.append(f"{path}: unexpected property '{name}'")
+
+    if isinstance(value, list) and 'items' in schema:
+        for i, item in enumerate(value):
+            check_value(item, schema['items'], f"{path}[{i}]", errors)
+
+def validate_data(data: Dict) -> List[str]:
+    """
+    Validate ontology data.
+
+    Returns:
+        list: Error messages (empty if the data is valid)
+    """
+    errors = []
+    check_value(data, load_schema(), '$', errors)
+    if errors:
+        return errors
+
+    node_ids = set()
+    for i, node in enumerate(data['nodes']):
+        if node['id'] in node_ids:
+            errors.append(f"$.nodes[{i}]: duplicate node ID '{node['id']}'")
+        node_ids.add(node['id'])
+
+    for i, edge in enumerate(data['edges']):
+        for end in ('source', 'target'):
+            if edge[end] not in node_ids:
+                errors.append(f"$.edges[{i}].{end}: unknown node ID '{edge[end]}'")
+
+    return errors